@@ -0,0 +1,51 @@
+import os
+from collections import namedtuple
+
+# 一次扫描的变化: added/modified为新增/修改的文件名, removed为已删除的文件名,
+# stats为当前所有题库文件的 {文件名: (大小, 修改时间)}
+ScanDiff = namedtuple('ScanDiff', ['added', 'modified', 'removed', 'stats'])
+
+
+def stat_docx_files(folder):
+    """用os.scandir获取文件夹中所有.docx文件的大小和修改时间"""
+    stats = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith('.docx') and entry.is_file():
+                st = entry.stat()
+                stats[entry.name] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def diff_stats(known, current):
+    """比较两次扫描的文件信息"""
+    added = [name for name in current if name not in known]
+    modified = [name for name in current if name in known and known[name] != current[name]]
+    removed = [name for name in known if name not in current]
+    return ScanDiff(added, modified, removed, current)
+
+
+class BankScanner:
+    """题库文件夹的增量扫描
+
+    manifest记录已处理过的文件的 (大小, 修改时间), 再次扫描时只报告
+    新增、修改和删除的文件。文件解析完成(无论成功与否)后由调用方record(),
+    未处理完的文件不会记入manifest, 下次扫描时仍会被报告。
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.manifest = {}  # {文件名: (大小, 修改时间)}
+
+    def scan(self, known=None):
+        """扫描文件夹, 返回相对known(默认为manifest)的变化"""
+        return diff_stats(self.manifest if known is None else known,
+                          stat_docx_files(self.folder))
+
+    def record(self, name, stat):
+        """记录已处理的文件"""
+        self.manifest[name] = stat
+
+    def forget(self, name):
+        """移除文件记录"""
+        self.manifest.pop(name, None)
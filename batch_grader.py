@@ -0,0 +1,270 @@
+"""批量阅卷
+
+把收集到的答题卡(CSV或JSONL)与题库一次性对照评分。答案编码为整数位掩码
+(见quiz_question.answer_mask), 所有答题卡组成一个 (学生数 × 题目数) 的
+NumPy数组, 评分只需几次整体的比较、位运算和求和。多选题少选时按
+quiz_question.partial_credit的规则计部分得分。
+
+答题卡格式(题号为题库中题目的顺序, 从1开始; 题库为文件夹时按文件名顺序连续编号):
+  CSV:   表头为 "学生,1,2,3,...", 之后每行一名学生, 未作答留空
+  JSONL: 每行 {"student": "张三", "answers": {"1": "A", "2": "BD"}},
+         answers也可以是按题号顺序排列的列表
+
+结果输出为 students.csv(每名学生)、questions.csv(每道题)和 types.csv(每种题型)。
+需要安装numpy。
+
+用法: python batch_grader.py 题库(.docx或文件夹) 答题卡文件... [-o 输出目录]
+"""
+import argparse
+import csv
+import json
+import os
+
+from quiz_question import QUESTION_TYPES, answer_mask
+
+
+def import_numpy():
+    """numpy只在批量阅卷时需要, 用到时再导入"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("批量阅卷需要numpy, 请先安装: pip install numpy") from None
+    return numpy
+
+
+def bit_count(np, masks):
+    """逐元素统计位掩码中1的个数"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+    # numpy 2.0以前没有bitwise_count, 按字节查表
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    counts = np.zeros(masks.shape, dtype=np.uint8)
+    for shift in (0, 8, 16, 24):
+        counts += table[(masks >> shift) & 0xFF]
+    return counts
+
+
+def load_bank(path):
+    """读取题库文件或文件夹(按文件名顺序)中的全部题目"""
+    from quiz_reader import QuizReader, list_docx_files
+
+    if not os.path.isdir(path):
+        return list(QuizReader(path).questions)
+    questions = []
+    for name in sorted(list_docx_files(path)):
+        try:
+            questions.extend(QuizReader(os.path.join(path, name)).questions)
+        except Exception as e:
+            print(f"读取 {name} 出错:{e}")
+    return questions
+
+
+def answer_text(answer):
+    """JSONL中的答案统一为文本: null为未作答, 列表如["B", "D"]拼接为BD"""
+    if answer is None:
+        return ''
+    if isinstance(answer, (list, tuple)):
+        return ''.join(map(str, answer))
+    return str(answer)
+
+
+def read_sheets(path, question_count):
+    """读取答题卡文件, 返回 (学生列表, 每名学生按题号排列的答案文本列表)"""
+    students = []
+    rows = []
+    if path.lower().endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    sheet = json.loads(line)
+                except ValueError as e:
+                    print(f"{path} 第{line_number}行格式错误:{e}")
+                    continue
+                answers = sheet.get('answers', {}) if isinstance(sheet, dict) else None
+                row = [''] * question_count
+                if isinstance(answers, dict):
+                    for number, answer in answers.items():
+                        # 无法识别的题号只跳过这一项
+                        try:
+                            position = int(number) - 1
+                        except (ValueError, TypeError):
+                            continue
+                        if 0 <= position < question_count:
+                            row[position] = answer_text(answer)
+                elif isinstance(answers, list):
+                    for position, answer in enumerate(answers[:question_count]):
+                        row[position] = answer_text(answer)
+                else:
+                    print(f"{path} 第{line_number}行answers格式错误")
+                    continue
+                students.append(str(sheet.get('student', len(students) + 1)))
+                rows.append(row)
+        return students, rows
+
+    # CSV(兼容Excel保存的带BOM文件)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return students, rows
+        positions = []
+        for column, number in enumerate(header[1:], 1):
+            try:
+                position = int(number) - 1
+            except ValueError:
+                continue
+            if 0 <= position < question_count:
+                positions.append((column, position))
+        for record in reader:
+            if not record:
+                continue
+            row = [''] * question_count
+            for column, position in positions:
+                if column < len(record):
+                    row[position] = record[column]
+            students.append(record[0])
+            rows.append(row)
+    return students, rows
+
+
+def encode_answers(rows, question_count):
+    """答案文本编码为 (学生数 × 题目数) 的位掩码数组
+
+    答题卡中的答案种类很少: 先把每个答案文本换成其编号(第一次出现的顺序),
+    只对不重复的文本计算位掩码, 再按编号整体展开。
+    """
+    np = import_numpy()
+    codes = {}
+    flat = np.fromiter((codes.setdefault(text, len(codes)) for row in rows for text in row),
+                       dtype=np.uint32, count=len(rows) * question_count)
+    masks = np.array([answer_mask(text) for text in codes], dtype=np.uint32)
+    return masks[flat].reshape(len(rows), question_count)
+
+
+class AnswerKey:
+    """题库的标准答案: 每道题的答案位掩码和题型序号"""
+
+    def __init__(self, questions):
+        np = import_numpy()
+        self.questions = questions
+        self.masks = np.array([question.answer_mask for question in questions], dtype=np.uint32)
+        type_ids = {q_type: i for i, q_type in enumerate(QUESTION_TYPES)}
+        self.types = np.array([type_ids.get(question.type, 0) for question in questions], dtype=np.int8)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def grade(self, students, masks):
+        """对全部答题卡评分"""
+        return GradeReport(self, students, masks)
+
+
+class GradeReport:
+    """一批答题卡的评分结果
+
+    correct和answered为 (学生数 × 题目数) 的布尔数组, credit为每道题的得分
+    (答对为1, 少选且没有选错为选对的比例), 其余统计都由它们求和得到。
+    """
+
+    def __init__(self, key, students, masks):
+        np = import_numpy()
+        self.key = key
+        self.students = students
+        self.masks = masks
+        self.answered = masks != 0
+        self.correct = (masks == key.masks) & self.answered
+        # 部分得分: 没有选错任何选项时为选对的比例(与partial_credit相同)
+        no_wrong = (masks & ~key.masks) == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = bit_count(np, masks) / bit_count(np, key.masks)
+        self.credit = np.where(no_wrong & self.answered & (key.masks != 0), ratio, 0.0)
+        # 题型的one-hot矩阵, 与correct相乘即得每名学生各题型的得分
+        type_matrix = (key.types[:, None] == np.arange(len(QUESTION_TYPES))).astype(np.int32)
+        self.student_scores = self.correct.sum(axis=1)
+        self.student_credit = self.credit.sum(axis=1)
+        self.student_answered = self.answered.sum(axis=1)
+        self.student_type_scores = self.correct.astype(np.int32) @ type_matrix
+        self.question_correct = self.correct.sum(axis=0)
+        self.question_answered = self.answered.sum(axis=0)
+        self.type_counts = type_matrix.sum(axis=0)
+
+    def type_summary(self):
+        """各题型的 (题目数, 平均得分, 正确率)"""
+        summary = {}
+        sheets = len(self.students)
+        for i, q_type in enumerate(QUESTION_TYPES):
+            count = int(self.type_counts[i])
+            total = int(self.student_type_scores[:, i].sum())
+            average = total / sheets if sheets else 0.0
+            summary[q_type] = (count, average, total / (sheets * count) if sheets and count else 0.0)
+        return summary
+
+    def write_csv(self, output_dir):
+        """输出 students.csv、questions.csv 和 types.csv"""
+        os.makedirs(output_dir, exist_ok=True)
+        total = len(self.key)
+
+        def open_csv(name):
+            # 带BOM以便用Excel直接打开
+            return open(os.path.join(output_dir, name), 'w', encoding='utf-8-sig', newline='')
+
+        with open_csv('students.csv') as f:
+            writer = csv.writer(f)
+            writer.writerow(['学生', '得分', '含部分得分', '总分', '作答题数'] + list(QUESTION_TYPES))
+            for i, student in enumerate(self.students):
+                writer.writerow([student, int(self.student_scores[i]), f"{self.student_credit[i]:.2f}",
+                                 total, int(self.student_answered[i])]
+                                + [int(score) for score in self.student_type_scores[i]])
+
+        with open_csv('questions.csv') as f:
+            writer = csv.writer(f)
+            writer.writerow(['题号', '题型', '题目', '正确答案', '作答人数', '答对人数', '正确率'])
+            for i, question in enumerate(self.key.questions):
+                answered = int(self.question_answered[i])
+                correct = int(self.question_correct[i])
+                rate = f"{correct / len(self.students):.1%}" if self.students else ''
+                writer.writerow([i + 1, question.type, question.text.strip(), question.answer,
+                                 answered, correct, rate])
+
+        with open_csv('types.csv') as f:
+            writer = csv.writer(f)
+            writer.writerow(['题型', '题目数', '平均得分', '正确率'])
+            for q_type, (count, average, rate) in self.type_summary().items():
+                writer.writerow([q_type, count, f"{average:.2f}", f"{rate:.1%}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按题库批量评阅答题卡(CSV或JSONL)")
+    parser.add_argument('bank', help="题库文件(.docx)或题库文件夹")
+    parser.add_argument('sheets', nargs='+', help="答题卡文件(.csv或.jsonl)")
+    parser.add_argument('-o', '--output', default='grade_results', help="结果输出目录, 默认grade_results")
+    args = parser.parse_args()
+
+    key = AnswerKey(load_bank(args.bank))
+    if not len(key):
+        print("题库中没有题目")
+        return
+    students = []
+    rows = []
+    for path in args.sheets:
+        try:
+            file_students, file_rows = read_sheets(path, len(key))
+        except Exception as e:
+            print(f"读取 {path} 出错:{e}")
+            continue
+        students.extend(file_students)
+        rows.extend(file_rows)
+
+    report = key.grade(students, encode_answers(rows, len(key)))
+    report.write_csv(args.output)
+    print(f"共 {len(key)} 道题目, {len(students)} 份答题卡")
+    for q_type, (count, average, rate) in report.type_summary().items():
+        if count:
+            print(f"  {q_type}: {count}题, 平均得分 {average:.2f}, 正确率 {rate:.1%}")
+    print(f"结果已保存到 {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""性能基准
+
+各脚本可以直接运行(python benchmarks/xxx.py), 也可以作为模块运行
+(python -m benchmarks.xxx)。synthetic_bank生成合成题库, run_benchmarks
+在1千/1万/10万题规模下运行主要路径的计时并保存为JSON。
+"""
@@ -0,0 +1,110 @@
+"""批量阅卷基准
+
+生成合成题库(默认100题, 单选/多选/判断混合)和答题卡(默认1万份), 写入临时CSV后
+分别用逐题比较答案字符串的方式和batch_grader的位掩码数组评分, 输出每秒评阅的答题卡数。
+需要安装numpy。
+
+用法: python benchmarks/bench_batch_grader.py [答题卡数量] [题目数量]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_grader import AnswerKey, encode_answers, read_sheets
+from quiz_question import Question, normalize_answer_letters
+
+
+def make_bank(count, seed=0):
+    rng = random.Random(seed)
+    questions = []
+    for i in range(count):
+        q_type = rng.choice(['单选题', '多选题', '判断题'])
+        if q_type == '判断题':
+            questions.append(Question.parse(f"判断题干{i}", [], rng.choice('对错'), q_type))
+            continue
+        options = [f"{label}. 选项{label}{i}" for label in 'ABCD']
+        if q_type == '多选题':
+            answer = ','.join(sorted(rng.sample('ABCD', rng.randint(2, 4))))
+        else:
+            answer = rng.choice('ABCD')
+        questions.append(Question.parse(f"题干{i}", options, answer, q_type))
+    return questions
+
+
+def make_answer(question, rng):
+    """随机作答: 约70%答对, 5%未作答, 多选题的字母顺序和分隔符随机"""
+    roll = rng.random()
+    if roll < 0.05:
+        return ''
+    if question.type == '判断题':
+        correct = '对' if question.answer == 'T' else '错'
+        return correct if roll < 0.75 else rng.choice('对错')
+    letters = list(question.answer) if roll < 0.75 else rng.sample(question.labels, rng.randint(1, 2))
+    rng.shuffle(letters)
+    return rng.choice(['', ',', ', ']).join(letters)
+
+
+def write_sheets(path, questions, sheets, seed=1):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['学生'] + [str(i + 1) for i in range(len(questions))])
+        for i in range(sheets):
+            writer.writerow([f"学生{i}"] + [make_answer(question, rng) for question in questions])
+
+
+def loop_grade(questions, rows):
+    """逐份逐题比较规范化后的答案字符串"""
+    scores = []
+    for row in rows:
+        score = 0
+        for question, answer in zip(questions, row):
+            if not answer:
+                continue
+            letters = normalize_answer_letters(answer, question.type)
+            if question.type == '多选题':
+                score += sorted(letters) == sorted(question.answer)
+            else:
+                score += letters == question.answer
+        scores.append(score)
+    return scores
+
+
+def main():
+    sheets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    questions = make_bank(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sheets.csv')
+        write_sheets(path, questions, sheets)
+
+        start = time.perf_counter()
+        students, rows = read_sheets(path, count)
+        read_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = loop_grade(questions, rows)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = encode_answers(rows, count)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    report = AnswerKey(questions).grade(students, masks)
+    grade_time = time.perf_counter() - start
+
+    assert report.student_scores.tolist() == expected
+    vector_time = encode_time + grade_time
+    print(f"{sheets} 份答题卡, {count} 道题目 (读取CSV {read_time:.2f}s)")
+    print(f"逐题比较:   {loop_time:.3f}s, {sheets / loop_time:,.0f} 份/秒")
+    print(f"位掩码数组: {vector_time:.3f}s, {sheets / vector_time:,.0f} 份/秒 "
+          f"(编码 {encode_time:.3f}s, 评分 {grade_time:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
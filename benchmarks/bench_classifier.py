@@ -0,0 +1,73 @@
+"""parse_questions 段落分类微基准
+
+在内存中生成合成题库文本(默认10万题), 分别用旧的逐条re.match/startswith分类方式
+和预编译的单次匹配分类器把每个段落分为答案行、题目行、选项行或其他, 输出每秒
+处理的段落数。两边只做分类、得到相同的结果列表(运行时会核对), 不包含构建题目的开销。
+
+用法: python benchmarks/bench_classifier.py [题目数量]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_reader import LINE_PATTERN, LINE_ANSWER, LINE_QUESTION, LINE_OPTION
+from benchmarks.synthetic_bank import make_lines
+
+
+def legacy_classify(lines):
+    """重构前parse_questions的分类方式(逐条startswith和re.match)"""
+    kinds = []
+    for text in lines:
+        text = text.strip()
+        if not text:
+            continue
+        if text.startswith(('答案：', 'Answer:', '答案:', 'Answer：', '正确答案:', '正确答案：')):
+            kinds.append(LINE_ANSWER)
+        elif re.match(r'^[0-9一二三四五六七八九十]+[.、]', text):
+            kinds.append(LINE_QUESTION)
+        elif re.match(r'^[A-Z][.、]', text) or re.match(r'^[A-Z]\s', text):
+            kinds.append(LINE_OPTION)
+        else:
+            kinds.append(None)
+    return kinds
+
+
+def classifier_classify(lines):
+    """parse_questions现在使用的预编译分类器(一次匹配)"""
+    kinds = []
+    for text in lines:
+        text = text.strip()
+        if not text:
+            continue
+        match = LINE_PATTERN.match(text)
+        kinds.append(match.lastgroup if match is not None else None)
+    return kinds
+
+
+def measure(func, lines, repeat=3):
+    """返回多次运行中最快的一次耗时"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(lines)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lines = make_lines(count)
+    print(f"合成题库: {count}题, {len(lines)}段")
+    if legacy_classify(lines) != classifier_classify(lines):
+        print("两种分类方式的结果不一致")
+        sys.exit(1)
+    for name, func in (('旧分类方式', legacy_classify), ('预编译分类器', classifier_classify)):
+        elapsed = measure(func, lines)
+        print(f"{name}: {elapsed:.3f}s, {len(lines) / elapsed:,.0f} 段/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""答题页面切换题目的基准
+
+模拟连续切换题目(默认1万次, 单选/多选/判断混合), 分别用旧的销毁重建方式
+和OptionPool复用控件的方式刷新选项区, 输出每次切换的耗时(平均/p50/p99)
+以及Tcl命令数、Tcl全局变量数和子控件数的增长。需要图形界面环境。
+
+用法: python benchmarks/bench_navigation.py [切换次数]
+"""
+import os
+import random
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from option_pool import OptionPool
+
+
+def make_questions(count=200, seed=0):
+    """生成 (题型, [(取值, 文字)]) 列表"""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(count):
+        q_type = rng.choice(['单选题', '多选题', '判断题'])
+        if q_type == '判断题':
+            options = [('T', '对'), ('F', '错')]
+        else:
+            labels = 'ABCDEF'[:rng.randint(2, 6)]
+            options = [(label, f"{label}. 选项{label}{i}") for label in labels]
+        questions.append((q_type, options))
+    return questions
+
+
+def legacy_display(options_frame, q_type, options, state):
+    """重构前display_question刷新选项区的方式"""
+    for widget in options_frame.winfo_children():
+        widget.destroy()
+    buttons = []
+    if q_type == "多选题":
+        state['vars'] = []
+    else:
+        state['var'] = tk.StringVar()
+    inner = ttk.Frame(options_frame)
+    inner.pack(fill="both", expand=True, padx=20, pady=10)
+    for value, text in options:
+        if q_type == "多选题":
+            var = tk.BooleanVar()
+            state['vars'].append(var)
+            btn = ttk.Checkbutton(inner, text=text.strip(), variable=var, style="TCheckbutton")
+            btn.option_value = value
+        else:
+            btn = ttk.Radiobutton(inner, text=text.strip(), value=value,
+                                  variable=state['var'], style="TRadiobutton")
+        btn.pack(anchor="w", pady=8)
+        buttons.append(btn)
+    return buttons
+
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+def tcl_counts(root):
+    return {
+        'commands': len(root.tk.splitlist(root.tk.call('info', 'commands'))),
+        'globals': len(root.tk.splitlist(root.tk.call('info', 'globals'))),
+        'widgets': count_widgets(root)
+    }
+
+
+def measure(root, name, display, questions, navigations):
+    frame = ttk.Frame(root)
+    frame.pack(fill="both", expand=True)
+    refresh = display(frame)
+    refresh(*questions[0])
+    root.update()
+    before = tcl_counts(root)
+    timings = []
+    for i in range(navigations):
+        q_type, options = questions[i % len(questions)]
+        start = time.perf_counter()
+        refresh(q_type, options)
+        root.update_idletasks()
+        timings.append(time.perf_counter() - start)
+    root.update()
+    after = tcl_counts(root)
+    frame.destroy()
+
+    timings.sort()
+    avg = sum(timings) / len(timings)
+    growth = ', '.join(f"{key} {after[key] - before[key]:+d}" for key in before)
+    print(f"{name:<8} 平均 {avg * 1000:7.3f}ms  p50 {timings[len(timings) // 2] * 1000:7.3f}ms  "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:7.3f}ms  增长: {growth}")
+
+
+def legacy_factory(frame):
+    state = {}
+    return lambda q_type, options: legacy_display(frame, q_type, options, state)
+
+
+def pooled_factory(frame):
+    pool = OptionPool(frame)
+
+    def refresh(q_type, options):
+        pool.show(options, q_type == "多选题")
+        pool.radio_var.set('')
+        for var in pool.vars(len(options)):
+            var.set(False)
+    return refresh
+
+
+def main():
+    navigations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    root = tk.Tk()
+    root.geometry("800x600")
+    questions = make_questions()
+    print(f"切换 {navigations} 次")
+    measure(root, "销毁重建", legacy_factory, questions, navigations)
+    measure(root, "控件复用", pooled_factory, questions, navigations)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
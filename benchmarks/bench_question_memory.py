@@ -0,0 +1,49 @@
+"""题目记录内存占用对比
+
+用合成题库(默认10万题)比较旧的题目字典和Question记录的内存占用。
+两种表示都经过一次pickle往返, 使所有字符串都是新分配的, 结果包含字符串本身。
+Question(含16字节的题目标识)不比题目字典小时以状态码1退出。
+
+用法: python benchmarks/bench_question_memory.py [题目数量]
+"""
+import os
+import pickle
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_reader import QuizReader
+from benchmarks.synthetic_bank import make_lines
+
+
+def measure_loaded_size(blob):
+    """返回反序列化后对象占用的内存(字节)"""
+    tracemalloc.start()
+    records = pickle.loads(blob)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    reader = QuizReader(None)
+    reader.parse_questions(make_lines(count))
+    questions = reader.questions
+    dicts = [question.to_dict() for question in questions]
+
+    dict_size = measure_loaded_size(pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL))
+    record_size = measure_loaded_size(pickle.dumps(questions, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"合成题库: {len(questions)}题")
+    print(f"题目字典: {dict_size / 1e6:.1f} MB, 每题 {dict_size / len(questions):.0f} 字节")
+    print(f"Question: {record_size / 1e6:.1f} MB, 每题 {record_size / len(questions):.0f} 字节")
+    print(f"减少: {(1 - record_size / dict_size) * 100:.1f}%")
+    if record_size >= dict_size:
+        print("未通过: Question占用的内存不少于题目字典")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
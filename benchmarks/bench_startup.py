@@ -0,0 +1,124 @@
+"""启动耗时基准
+
+1. 用 python -X importtime 统计 import quiz_gui 的累计导入耗时, 列出最慢的模块,
+   并检查预算: quiz_gui的累计导入耗时不超过--budget毫秒, 启动时不导入
+   python-docx、multiprocessing和numpy(它们只在解析、扫描或批量阅卷时才需要)。
+2. 有图形界面时, 在子进程中计时从进程启动到主窗口显示(使用临时数据库)。
+
+每项运行多次取最快的一次; 超出预算时以状态码1退出, 便于在脚本中检查。
+
+用法: python benchmarks/bench_startup.py [--repeat 5] [--budget 150] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 启动时不应导入的模块(及其子模块)
+FORBIDDEN_MODULES = ('docx', 'lxml', 'multiprocessing', 'numpy')
+
+# 子进程: 创建主窗口, 窗口显示后输出耗时(秒)并退出
+FIRST_WINDOW_SCRIPT = """
+import os, sys, tempfile, time
+sys.path.insert(0, {root!r})
+import quiz_gui
+from quiz_store import QuizStore
+
+tmp = tempfile.mkdtemp()
+
+class TempStore(QuizStore):
+    def __init__(self, db_path=os.path.join(tmp, 'quiz_data.db')):
+        super().__init__(db_path)
+
+quiz_gui.QuizStore = TempStore
+root = quiz_gui.tk.Tk()
+app = quiz_gui.QuizApp(root)
+root.wait_visibility(root)
+print(time.time() - {started!r})
+app.on_close()
+"""
+
+
+def import_times():
+    """运行一次 -X importtime, 返回 {模块名: 累计耗时(毫秒)}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import quiz_gui'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "导入失败")
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def has_display():
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def first_window_time():
+    """从启动子进程到主窗口显示的耗时(秒)"""
+    started = time.time()
+    script = FIRST_WINDOW_SCRIPT.format(root=ROOT, started=started)
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "启动失败")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="统计启动耗时并检查导入预算")
+    parser.add_argument('--repeat', type=int, default=5, help="运行次数, 取最快的一次")
+    parser.add_argument('--budget', type=float, default=150, help="import quiz_gui的累计耗时预算(毫秒)")
+    parser.add_argument('--top', type=int, default=10, help="列出最慢的模块数")
+    args = parser.parse_args()
+
+    # 第一次运行可能要编译.pyc, 不计入结果
+    import_times()
+    best = None
+    for _ in range(args.repeat):
+        times = import_times()
+        if best is None or times['quiz_gui'] < best['quiz_gui']:
+            best = times
+
+    # 只列出quiz_gui直接或间接导入的顶层模块
+    print(f"import quiz_gui: {best['quiz_gui']:.1f}ms (预算 {args.budget:.0f}ms)")
+    top_level = sorted(((ms, name) for name, ms in best.items()
+                        if name != 'quiz_gui' and '.' not in name), reverse=True)
+    for ms, name in top_level[:args.top]:
+        print(f"  {name:<28} {ms:8.1f}ms")
+
+    failures = []
+    if best['quiz_gui'] > args.budget:
+        failures.append(f"导入耗时 {best['quiz_gui']:.1f}ms 超出预算 {args.budget:.0f}ms")
+    imported = sorted({name.split('.')[0] for name in best} & set(FORBIDDEN_MODULES))
+    if imported:
+        failures.append(f"启动时导入了 {', '.join(imported)}")
+
+    if has_display():
+        try:
+            seconds = min(first_window_time() for _ in range(args.repeat))
+            print(f"首个窗口显示: {seconds * 1000:.0f}ms")
+        except Exception as e:
+            print(f"计时首个窗口时出错:{e}")
+    else:
+        print("没有图形界面(DISPLAY未设置), 跳过首个窗口计时")
+
+    for failure in failures:
+        print(f"未通过: {failure}")
+    if failures:
+        sys.exit(1)
+    print("导入预算检查通过")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""主要路径的计时基准
+
+在临时目录中用synthetic_bank生成各规模(默认1千/1万/10万题)的题库, 依次计时:
+
+  parse_stream    流式后端解析单个题库文件(不使用缓存)
+  parse_docx      python-docx后端解析(只在1万题及以下运行, 更大时太慢)
+  parse_cached    从解析缓存读取同一文件
+  scan_cold       扫描题库文件夹(每个文件1000题)并解析全部文件, 缓存为空
+  scan_warm       重新打开程序后扫描同一文件夹, 全部从缓存读取
+  index_build     多个题库合并为QuestionIndex(去重)
+  exam_sample     按考试配置(50/30/20题)从索引中抽题, 计100次
+  question_key    计算全部题目的Question.key
+  record_answer   错题本已有该规模的错题时, 记录1000次答题(SQLite)
+
+每项取多次运行中最快的一次, 结果保存为JSON; 指定--compare时与之前的结果对比。
+
+用法: python benchmarks/run_benchmarks.py [--sizes 1000 10000 100000] [--repeat 3]
+                                          [--output 结果.json] [--compare 旧结果.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz_cache
+from bank_scanner import BankScanner
+from benchmarks.synthetic_bank import write_bank, write_bank_folder
+from question_index import QuestionIndex
+from quiz_cache import ParseCache
+from quiz_question import question_key
+from quiz_reader import QuizReader
+from quiz_store import QuizStore
+
+# 结果格式版本, 不同版本的结果不做对比
+RESULT_VERSION = 1
+
+# 考试模式各题型的抽题数量
+EXAM_COUNTS = {'单选题': 50, '多选题': 30, '判断题': 20}
+
+# record_answer计时的答题次数
+ANSWERS = 1000
+
+
+def best_of(func, repeat):
+    """运行repeat次, 返回最短耗时(秒)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def use_cache_dir(cache_dir):
+    """让QuizReader使用指定目录的解析缓存"""
+    quiz_cache._parse_cache = ParseCache(cache_dir)
+
+
+def read_folder(folder):
+    """按GUI的方式扫描文件夹并读取其中所有题库, 返回 {文件名: 题目列表}"""
+    scanner = BankScanner(folder)
+    banks = {}
+    for name in sorted(scanner.scan().added):
+        banks[name] = QuizReader(os.path.join(folder, name)).questions
+    return banks
+
+
+def fill_wrong_book(store, questions):
+    """把题目全部加入错题本(一次事务)"""
+    now = time.time()
+    with store.conn:
+        for question in questions:
+            store._save_question(question)
+            store.conn.execute(
+                'INSERT OR IGNORE INTO wrong_questions (hash, type, added_at, updated_at, due_at) '
+                'VALUES (?, ?, ?, ?, ?)', (question.key, question.type, now, now, now))
+
+
+def run_size(size, repeat, tmp):
+    """运行一个规模的全部基准, 返回 {名称: 结果}"""
+    results = {}
+
+    def record(name, seconds, items):
+        results[name] = {
+            'seconds': round(seconds, 6),
+            'items': items,
+            'per_item_us': round(seconds / items * 1e6, 3) if items else None
+        }
+        print(f"  {name:<14} {seconds:9.4f}s  {items:>7} 项  "
+              f"{seconds / items * 1e6 if items else 0:10.2f} µs/项")
+
+    work = os.path.join(tmp, str(size))
+    os.makedirs(work)
+    bank_path = os.path.join(work, 'bank.docx')
+    write_bank(bank_path, size)
+    folder = os.path.join(work, 'folder')
+    write_bank_folder(folder, size)
+
+    # 解析
+    record('parse_stream', best_of(lambda: QuizReader(bank_path, use_cache=False), repeat), size)
+    if size <= 10000:
+        record('parse_docx', best_of(lambda: QuizReader(bank_path, use_cache=False, backend='docx'), repeat),
+               size)
+    use_cache_dir(os.path.join(work, 'cache_single'))
+    QuizReader(bank_path)
+    record('parse_cached', best_of(lambda: QuizReader(bank_path), repeat), size)
+
+    # 文件夹扫描: 每次使用新的缓存目录才是冷启动
+    cold_dirs = iter(os.path.join(work, f'cache_cold_{i}') for i in range(repeat))
+    record('scan_cold', best_of(lambda: (use_cache_dir(next(cold_dirs)), read_folder(folder)), repeat), size)
+    use_cache_dir(os.path.join(work, 'cache_warm'))
+    read_folder(folder)
+    record('scan_warm', best_of(lambda: read_folder(folder), repeat), size)
+
+    # 合并索引和考试抽题
+    banks = read_folder(folder)
+
+    def build_index():
+        index = QuestionIndex()
+        for name, questions in banks.items():
+            index.add_source(name, questions)
+        return index
+    record('index_build', best_of(build_index, repeat), size)
+    index = build_index()
+    rng = random.Random(0)
+
+    def sample_exams():
+        for _ in range(100):
+            for q_type, count in EXAM_COUNTS.items():
+                index.sample(q_type, count, rng)
+    record('exam_sample', best_of(sample_exams, repeat), 100)
+
+    # 题目标识
+    questions = [question for questions in banks.values() for question in questions]
+    record('question_key',
+           best_of(lambda: [question_key(q.text, q.option_texts) for q in questions], repeat), size)
+
+    # 答题记录: 错题本规模为size时每次作答的耗时
+    store = QuizStore(os.path.join(work, 'quiz_data.db'))
+    fill_wrong_book(store, questions)
+    answers = [questions[i % len(questions)] for i in range(ANSWERS)]
+
+    def record_answers():
+        for i, question in enumerate(answers):
+            store.record_answer(question, question.answer, i % 3 != 0, 'normal', remove_threshold=1000)
+    record('record_answer', best_of(record_answers, repeat), ANSWERS)
+    store.close()
+    return results
+
+
+def compare(results, old):
+    """输出与之前结果的对比(新耗时/旧耗时)"""
+    if old.get('version') != RESULT_VERSION:
+        print("旧结果的格式版本不同, 不做对比")
+        return
+    print("\n与之前结果对比(耗时比, 小于1为变快):")
+    for size, benches in results['results'].items():
+        old_benches = old.get('results', {}).get(size, {})
+        for name, result in benches.items():
+            previous = old_benches.get(name)
+            if previous and previous['seconds']:
+                print(f"  {size:>7} {name:<14} {previous['seconds']:9.4f}s -> {result['seconds']:9.4f}s  "
+                      f"x{result['seconds'] / previous['seconds']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行主要路径的计时基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="题目数量")
+    parser.add_argument('--repeat', type=int, default=3, help="每项运行次数, 取最快的一次")
+    parser.add_argument('--output', default='benchmark_results.json', help="结果文件")
+    parser.add_argument('--compare', help="要对比的旧结果文件")
+    args = parser.parse_args()
+
+    results = {
+        'version': RESULT_VERSION,
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'repeat': args.repeat
+        },
+        'results': {}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            print(f"{size} 题:")
+            results['results'][str(size)] = run_size(size, args.repeat, tmp)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存到 {args.output}")
+
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                old = json.load(f)
+        except Exception as e:
+            print(f"读取 {args.compare} 出错:{e}")
+            return
+        compare(results, old)
+
+
+if __name__ == '__main__':
+    main()
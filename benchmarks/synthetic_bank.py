@@ -0,0 +1,132 @@
+"""合成题库生成器
+
+生成QuizReader.parse_questions能够解析的题库文本, 并直接写出.docx文件
+(手工拼装最小的WordprocessingML压缩包, 不依赖python-docx, 10万题只需几秒)。
+可以设置题目数量、题型比例、选项数量和答案前缀的写法。
+
+用法: python benchmarks/synthetic_bank.py 输出.docx [题目数量] [--options 4] [--seed 0]
+"""
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+# 题库中出现过的各种答案前缀写法
+ANSWER_PREFIXES = ('答案：', '答案:', 'Answer:', 'Answer：', '正确答案:', '正确答案：')
+
+# 默认题型比例
+DEFAULT_TYPE_MIX = {'单选题': 0.5, '多选题': 0.3, '判断题': 0.2}
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+
+DOCUMENT_TAIL = '</w:body></w:document>'
+
+
+def make_lines(count, type_mix=DEFAULT_TYPE_MIX, option_count=4,
+               answer_prefixes=ANSWER_PREFIXES, seed=0, start=1):
+    """生成count道题目的段落文本, 题号从start开始
+
+    题号、选项分隔符、多选题标记和答案分隔符随机使用题库中常见的几种写法,
+    每道题之后有一个空段落。题干和选项内容含题号, 不同题号的题目互不重复。
+    """
+    rng = random.Random(seed)
+    types = list(type_mix)
+    weights = [type_mix[q_type] for q_type in types]
+    labels = ''.join(chr(65 + i) for i in range(option_count))
+    lines = []
+    for i in range(start, start + count):
+        q_type = rng.choices(types, weights)[0]
+        prefix = rng.choice(answer_prefixes)
+        if q_type == '判断题':
+            lines.append(f"{i}{rng.choice('.、')} 判断题干{i}")
+            lines.append(prefix + rng.choice(['对', '错', 'T', 'F']))
+            lines.append("")
+            continue
+        if q_type == '多选题':
+            marker = rng.choice(['(多选题) ', '(多选题)', ''])
+            lines.append(f"{i}{rng.choice('.、')}{marker}题干{i} 共有( )部分。")
+            answer = sorted(rng.sample(labels, rng.randint(2, option_count)))
+            answer = rng.choice([',', '，', '']).join(answer)
+        else:
+            lines.append(f"{i}{rng.choice('.、')}题干{i} 是( )。")
+            answer = rng.choice(labels)
+        for label in labels:
+            lines.append(f"{label}{rng.choice(['.', '、', ' '])}选项{label}{i}")
+        lines.append(prefix + answer)
+        lines.append("")
+    return lines
+
+
+def document_xml(lines):
+    """段落文本拼成word/document.xml"""
+    parts = [DOCUMENT_HEAD]
+    for text in lines:
+        if text:
+            parts.append(f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+        else:
+            parts.append('<w:p/>')
+    parts.append(DOCUMENT_TAIL)
+    return ''.join(parts)
+
+
+def write_docx(path, lines):
+    """把段落文本写成.docx文件"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', PACKAGE_RELS)
+        archive.writestr('word/document.xml', document_xml(lines))
+
+
+def write_bank(path, count, **kwargs):
+    """生成count道题目的题库文件, 其余参数同make_lines"""
+    write_docx(path, make_lines(count, **kwargs))
+
+
+def write_bank_folder(folder, count, per_file=1000, seed=0, **kwargs):
+    """在folder中生成共count道题目的多个题库文件(每个最多per_file题), 返回文件名列表"""
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for number, start in enumerate(range(0, count, per_file), 1):
+        name = f"bank_{number:04d}.docx"
+        write_bank(os.path.join(folder, name), min(per_file, count - start),
+                   seed=seed + number, start=start + 1, **kwargs)
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成题库(.docx)")
+    parser.add_argument('output', help="输出的.docx文件")
+    parser.add_argument('count', nargs='?', type=int, default=1000, help="题目数量, 默认1000")
+    parser.add_argument('--options', type=int, default=4, help="选项数量, 默认4")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子, 默认0")
+    args = parser.parse_args()
+    write_bank(args.output, args.count, option_count=args.options, seed=args.seed)
+    print(f"已生成 {args.output}: {args.count}题")
+
+
+if __name__ == '__main__':
+    main()
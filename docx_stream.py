@@ -0,0 +1,90 @@
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+# WordprocessingML 命名空间
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+W_P = W_NS + 'p'
+W_R = W_NS + 'r'
+W_HYPERLINK = W_NS + 'hyperlink'
+W_T = W_NS + 't'
+W_BR = W_NS + 'br'
+W_TYPE = W_NS + 'type'
+
+# 与python-docx中Run.text一致的内联元素到文本的映射(w:br单独处理)
+RUN_CHILD_TEXT = {
+    W_NS + 'tab': '\t',
+    W_NS + 'ptab': '\t',
+    W_NS + 'cr': '\n',
+    W_NS + 'noBreakHyphen': '-',
+}
+
+
+def find_document_part(archive):
+    """根据包关系找到正文部件的路径, 找不到时使用默认位置"""
+    try:
+        with archive.open('_rels/.rels') as f:
+            rels = ET.parse(f).getroot()
+        for rel in rels.iter(REL_NS + 'Relationship'):
+            if rel.get('Type') == OFFICE_DOCUMENT_REL and rel.get('TargetMode') != 'External':
+                return posixpath.normpath(rel.get('Target').lstrip('/'))
+    except (KeyError, ET.ParseError):
+        pass
+    return 'word/document.xml'
+
+
+def run_text(run):
+    """取得一个w:r元素的文本"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or '')
+        elif tag == W_BR:
+            # 只有普通换行对应换行符, 分页/分栏符不产生文本
+            if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in RUN_CHILD_TEXT:
+            parts.append(RUN_CHILD_TEXT[tag])
+    return ''.join(parts)
+
+
+def paragraph_text(paragraph):
+    """取得一个w:p元素的文本(包含超链接中的文字)"""
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(run_text(child))
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    parts.append(run_text(run))
+    return ''.join(parts)
+
+
+def iter_paragraph_texts(docx_path):
+    """逐段读取docx正文的文本
+
+    直接以zip方式打开文档并增量解析正文XML, 每处理完一个正文级元素就将其清除,
+    内存占用只与单个段落(或表格)的大小有关, 与文档总长度无关。
+    与python-docx的Document.paragraphs一致, 只返回正文直接包含的段落,
+    表格内的段落不会返回。
+    """
+    with zipfile.ZipFile(docx_path) as archive:
+        part_name = find_document_part(archive)
+        with archive.open(part_name) as f:
+            stack = []
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                # stack为[w:document, w:body]时, elem是正文直接包含的元素
+                if len(stack) == 2:
+                    if elem.tag == W_P:
+                        yield paragraph_text(elem)
+                    elem.clear()
+                    stack[-1].remove(elem)
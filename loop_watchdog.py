@@ -0,0 +1,142 @@
+import sys
+import threading
+import time
+import traceback
+
+from quiz_metrics import Histogram
+
+
+def running_callback(stack):
+    """从主线程的调用栈中找出正在执行的Tk回调, 返回 "函数名 (文件:行号)"
+
+    Tk回调经由tkinter的CallWrapper.__call__(按钮、事件)或after的callit进入Python,
+    其后的第一帧就是回调本身; 找不到时(如Tcl正在重绘)返回栈顶的帧。
+    """
+    for i in range(len(stack) - 2, -1, -1):
+        frame = stack[i]
+        if frame.name in ('__call__', 'callit') and 'tkinter' in frame.filename:
+            callback = stack[i + 1]
+            break
+    else:
+        if not stack:
+            return None
+        callback = stack[-1]
+    return f"{callback.name} ({callback.filename}:{callback.lineno})"
+
+
+class LoopWatchdog:
+    """Tk事件循环卡顿监视
+
+    每隔interval秒用root.after安排一次心跳, 记录每次心跳比预定时间晚了多久。
+    辅助线程发现心跳超过threshold秒未到时, 用sys._current_frames()采集一次
+    主线程的调用栈; 迟到的心跳到达后把这次卡顿连同正在执行的回调和调用栈记入stalls。
+    """
+
+    def __init__(self, root, interval=0.1, threshold=0.25, max_stalls=50):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.max_stalls = max_stalls
+        self.lag = Histogram()  # 心跳延迟(微秒)
+        self.stalls = []  # 最早的max_stalls次卡顿: {'lag_ms', 'callback', 'stack'}
+        self.stall_count = 0
+        self.stall_callbacks = {}  # {回调: (次数, 总卡顿毫秒)}
+        self.timer = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.last_beat = None
+        self.expected = None
+        self.sample = None  # 本次卡顿期间采集的调用栈
+
+    def start(self):
+        now = time.perf_counter()
+        self.last_beat = now
+        self.expected = now + self.interval
+        self.timer = self.root.after(int(self.interval * 1000), self._beat)
+        self.thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.timer is not None:
+            try:
+                self.root.after_cancel(self.timer)
+            except Exception:
+                pass
+            self.timer = None
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def _beat(self):
+        """心跳(在Tk主线程中执行)"""
+        now = time.perf_counter()
+        lag = max(0.0, now - self.expected)
+        with self.lock:
+            self.lag.add(lag * 1e6)
+            sample, self.sample = self.sample, None
+            self.last_beat = now
+        if lag >= self.threshold:
+            self._record_stall(lag, sample)
+        self.expected = now + self.interval
+        if not self.stop_event.is_set():
+            self.timer = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _record_stall(self, lag, stack):
+        callback = running_callback(stack) if stack else None
+        key = callback or "(未采集到调用栈)"
+        with self.lock:
+            self.stall_count += 1
+            count, total = self.stall_callbacks.get(key, (0, 0.0))
+            self.stall_callbacks[key] = (count + 1, total + lag * 1000)
+            if len(self.stalls) < self.max_stalls:
+                self.stalls.append({
+                    'lag_ms': round(lag * 1000, 1),
+                    'callback': callback,
+                    'stack': [f"{frame.filename}:{frame.lineno} {frame.name}" for frame in stack or ()]
+                })
+
+    def _watch(self):
+        """辅助线程: 心跳超时时采集主线程的调用栈(每次卡顿采集一次)"""
+        main_id = threading.main_thread().ident
+        overdue = self.interval + self.threshold
+        while not self.stop_event.wait(self.threshold / 2):
+            with self.lock:
+                if self.sample is not None or time.perf_counter() - self.last_beat < overdue:
+                    continue
+            frame = sys._current_frames().get(main_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self.lock:
+                if self.sample is None:
+                    self.sample = stack
+
+    def report(self):
+        """卡顿统计(可保存为JSON)"""
+        with self.lock:
+            lag = self.lag.to_dict()
+            del lag['buckets']
+            worst = sorted(self.stall_callbacks.items(), key=lambda item: item[1][1], reverse=True)
+            return {
+                'interval_ms': self.interval * 1000,
+                'threshold_ms': self.threshold * 1000,
+                'lag': lag,
+                'stall_count': self.stall_count,
+                'stall_callbacks': [{'callback': callback, 'count': count, 'total_ms': round(total, 1)}
+                                    for callback, (count, total) in worst],
+                'stalls': list(self.stalls)
+            }
+
+    def summary(self):
+        """会话结束时输出的摘要"""
+        with self.lock:
+            lines = [f"事件循环延迟: p50 {self.lag.percentile(50) / 1000:.1f}ms, "
+                     f"p99 {self.lag.percentile(99) / 1000:.1f}ms, 最大 {self.lag.max / 1000:.1f}ms, "
+                     f"超过{self.threshold * 1000:.0f}ms的卡顿 {self.stall_count} 次"]
+            worst = sorted(self.stall_callbacks.items(), key=lambda item: item[1][1], reverse=True)
+            for callback, (count, total) in worst[:5]:
+                lines.append(f"  {callback}: {count}次, 共{total:.0f}ms")
+        return '\n'.join(lines)
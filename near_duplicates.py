@@ -0,0 +1,151 @@
+"""近似重复题目检测
+
+把题干和(排序后的)选项内容规范化后切成字符n-gram, 计算MinHash签名,
+再用LSH分段把签名分入桶中, 只比较落入同一桶的题目, 总耗时随题目数量
+近似线性增长。签名采用单次哈希分桶(one permutation hashing)并对空桶做旋转填充,
+每个n-gram只需计算一次哈希。
+
+既可在加载题库时合并近似重复的题目(见QuestionIndex), 也可单独运行输出报告:
+
+用法: python near_duplicates.py 题库文件夹 [--threshold 0.8]
+"""
+import argparse
+import os
+import zlib
+
+from quiz_question import NUMBERING, normalize_text
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+
+def fingerprint_text(question):
+    """用于比较的文本: 去掉题号和题型标记的规范化题干 + 排序后的规范化选项"""
+    text = NUMBERING.sub('', normalize_text(question['question']))
+    options = sorted(normalize_text(option) for option in question.option_texts)
+    return '|'.join([text] + options)
+
+
+def shingles(text, n=3):
+    """字符n-gram集合"""
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NearDuplicateDetector:
+    """基于MinHash + LSH的近似重复检测
+
+    add()逐道加入题目, 若与已加入的某道题目估计的Jaccard相似度不低于threshold,
+    返回那道题目的id, 否则返回None。每道题目最多与max_candidates个候选比较,
+    避免大量相似的模板化题目落入同一个桶时退化为平方复杂度。
+    """
+
+    def __init__(self, threshold=0.8, bins=64, bands=16, ngram=3, max_candidates=200):
+        if bins % bands:
+            raise ValueError("bins必须是bands的整数倍")
+        self.threshold = threshold
+        self.bins = bins
+        self.bands = bands
+        self.rows = bins // bands
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self.shift = 64 - (bins - 1).bit_length()  # 高位用于选桶
+        self.value_mask = (1 << self.shift) - 1
+        self.buckets = [{} for _ in range(bands)]  # 每段: {(题型, 签名片段): [id]}
+        self.signatures = {}  # {id: 签名}
+
+    def signature(self, question):
+        """题目的MinHash签名"""
+        mins = [None] * self.bins
+        for gram in shingles(fingerprint_text(question), self.ngram):
+            h = (zlib.crc32(gram.encode('utf-8')) * GOLDEN) & MASK64
+            slot = h >> self.shift
+            value = h & self.value_mask
+            if mins[slot] is None or value < mins[slot]:
+                mins[slot] = value
+        # 空桶借用右侧(循环)第一个非空桶的值, 加上距离以区分来源
+        signature = list(mins)
+        if None in mins:
+            next_value = next_pos = None
+            for i in range(2 * self.bins - 1, -1, -1):
+                value = mins[i % self.bins]
+                if value is not None:
+                    next_value, next_pos = value, i
+                elif i < self.bins:
+                    signature[i] = next_value + (next_pos - i) * (self.value_mask + 1)
+        return tuple(signature)
+
+    def similarity(self, sig_a, sig_b):
+        """由签名估计的Jaccard相似度"""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / self.bins
+
+    def add(self, item_id, question):
+        """加入一道题目, 返回与之近似重复的已有题目id(没有时为None)
+
+        重复的题目不会加入索引, 之后的题目只会与保留的那一份比较。
+        """
+        sig = self.signature(question)
+        rows = self.rows
+        # 桶的键包含题型, 只有同类型的题目才会被视为重复
+        q_type = question['type']
+        keys = [(q_type, sig[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+        checked = set()
+        for band, key in enumerate(keys):
+            for other in self.buckets[band].get(key, ()):
+                if other in checked:
+                    continue
+                checked.add(other)
+                if self.similarity(sig, self.signatures[other]) >= self.threshold:
+                    return other
+                if len(checked) >= self.max_candidates:
+                    break
+            else:
+                continue
+            break
+        self.signatures[item_id] = sig
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, []).append(item_id)
+        return None
+
+
+def find_near_duplicates(items, threshold=0.8):
+    """items为 [(id, 题目)], 返回近似重复的分组 [[保留的id, 重复的id, ...]]"""
+    detector = NearDuplicateDetector(threshold)
+    groups = {}
+    for item_id, question in items:
+        match = detector.add(item_id, question)
+        if match is not None:
+            groups.setdefault(match, [match]).append(item_id)
+    return list(groups.values())
+
+
+def main():
+    from quiz_reader import QuizReader, list_docx_files
+
+    parser = argparse.ArgumentParser(description="输出题库文件夹中近似重复的题目")
+    parser.add_argument('folder', help="题库文件夹")
+    parser.add_argument('--threshold', type=float, default=0.8, help="相似度阈值(0-1), 默认0.8")
+    args = parser.parse_args()
+
+    questions = []
+    for name in sorted(list_docx_files(args.folder)):
+        try:
+            reader = QuizReader(os.path.join(args.folder, name))
+        except Exception as e:
+            print(f"读取 {name} 出错:{e}")
+            continue
+        questions.extend((name, question) for question in reader.questions)
+
+    groups = find_near_duplicates(enumerate(q for _, q in questions), args.threshold)
+    for number, group in enumerate(groups, 1):
+        print(f"\n第{number}组:")
+        for item_id in group:
+            name, question = questions[item_id]
+            print(f"  [{name}] [{question.type}] {question.text.strip()} (答案: {question.answer})")
+    print(f"\n共 {len(questions)} 道题目, {len(groups)} 组近似重复, "
+          f"涉及 {sum(len(group) - 1 for group in groups)} 道重复题目")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class OptionPool:
+    """答题页面的选项控件池
+
+    单选/判断题使用Radiobutton, 多选题使用Checkbutton, 两类控件各自缓存,
+    切换题目时只改写文字、取值和样式, 不再销毁重建控件和Tk变量。
+    单选共用一个StringVar, 每个多选控件固定绑定一个BooleanVar。
+    """
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.radio_var = tk.StringVar()
+        self.radio_buttons = []
+        self.check_buttons = []
+        self.check_vars = []
+        self.shown = []  # 当前显示的控件(按显示顺序)
+
+    def _radio(self, i):
+        while len(self.radio_buttons) <= i:
+            self.radio_buttons.append(ttk.Radiobutton(self.frame, variable=self.radio_var,
+                                                      style="TRadiobutton"))
+        return self.radio_buttons[i]
+
+    def _check(self, i):
+        while len(self.check_buttons) <= i:
+            var = tk.BooleanVar()
+            self.check_vars.append(var)
+            self.check_buttons.append(ttk.Checkbutton(self.frame, variable=var,
+                                                      style="TCheckbutton"))
+        return self.check_buttons[i]
+
+    def show(self, options, multiple):
+        """显示选项 [(取值, 文字)], multiple为True时使用复选框; 返回显示的控件列表"""
+        buttons = []
+        for i, (value, text) in enumerate(options):
+            if multiple:
+                btn = self._check(i)
+                btn.configure(text=text.strip(), style="TCheckbutton")
+                # 保存选项值用于后续判断
+                btn.option_value = value
+            else:
+                btn = self._radio(i)
+                btn.configure(text=text.strip(), value=value, style="TRadiobutton")
+                btn.option_value = value
+            buttons.append(btn)
+
+        # 显示的控件变化时才重新布局
+        if buttons != self.shown:
+            for btn in self.shown:
+                btn.pack_forget()
+            for btn in buttons:
+                btn.pack(anchor="w", pady=8)
+            self.shown = buttons
+        return buttons
+
+    def vars(self, count):
+        """前count个复选框的变量"""
+        return self.check_vars[:count]
@@ -0,0 +1,119 @@
+import random
+from array import array
+
+from quiz_question import QUESTION_TYPES, normalize_text
+
+
+def answer_signature(question):
+    """与选项顺序无关的答案表示: 正确选项的规范化内容; 判断题为 T/F"""
+    if not question.labels:
+        return question.answer
+    return frozenset(normalize_text(text) for label, text in question.choices if label in question.answer)
+
+
+def answer_text(question):
+    """用于报告的答案: 正确选项的标记和内容"""
+    if not question.labels:
+        return question.answer
+    return ', '.join(f"{label}. {text}" for label, text in question.choices if label in question.answer)
+
+
+class QuestionIndex:
+    """多个题库合并后的题目索引
+
+    题目按来源文件依次追加到同一个列表中, 同时按题型记录位置数组,
+    按来源文件记录位置数组和题型数量。抽取k道某类型题目只需在位置数组中
+    随机取k个位置, 不再扫描全部题目。
+
+    加入题目时按Question.key去重: 多个题库中的同一题目只保留第一次出现的一份,
+    并记录所有来源文件; 答案不一致的重复题目记入conflicts。
+    传入near_duplicates(NearDuplicateDetector)时, 近似重复的题目也按重复处理。
+    """
+
+    def __init__(self, near_duplicates=None):
+        self.near_duplicates = near_duplicates
+        self.questions = []
+        self.by_type = {q_type: array('I') for q_type in QUESTION_TYPES}  # {题型: 位置数组}
+        self.by_key = {}  # {题目标识: 位置}
+        self.by_source = {}  # {来源文件: 位置数组}
+        self.source_counts = {}  # {来源文件: {题型: 数量}}
+        self.source_names = []  # 来源文件名, 按加入顺序
+        self.first_source = array('I')  # 每道题第一次出现的来源序号
+        self.extra_sources = {}  # {位置: [其他来源序号]}, 只记录重复题目
+        self.conflicts = {}  # {位置: [(来源文件, 答案)]}, 答案不一致的重复题目
+        self.duplicates = 0  # 被合并的重复题目数量
+
+    def add_source(self, source, questions):
+        """加入一个题库的全部题目"""
+        source_id = len(self.source_names)
+        self.source_names.append(source)
+        source_positions = array('I')
+        counts = {q_type: 0 for q_type in QUESTION_TYPES}
+        for question in questions:
+            q_type = question['type']
+            counts[q_type] = counts.get(q_type, 0) + 1
+            position = self.by_key.get(question.key)
+            if position is None and self.near_duplicates is not None:
+                position = self.near_duplicates.add(len(self.questions), question)
+                if position is not None:
+                    self.by_key[question.key] = position
+            if position is not None:
+                # 重复题目: 记录来源并检查答案是否一致
+                self.duplicates += 1
+                self.extra_sources.setdefault(position, []).append(source_id)
+                source_positions.append(position)
+                kept = self.questions[position]
+                if answer_signature(question) != answer_signature(kept):
+                    conflict = self.conflicts.get(position)
+                    if conflict is None:
+                        conflict = self.conflicts[position] = [
+                            (self.source_names[self.first_source[position]], answer_text(kept))]
+                    conflict.append((source, answer_text(question)))
+                continue
+            position = len(self.questions)
+            self.questions.append(question)
+            self.by_key[question.key] = position
+            self.first_source.append(source_id)
+            if q_type not in self.by_type:
+                self.by_type[q_type] = array('I')
+            self.by_type[q_type].append(position)
+            source_positions.append(position)
+        self.by_source[source] = source_positions
+        self.source_counts[source] = counts
+
+    def __len__(self):
+        return len(self.questions)
+
+    def count(self, q_type):
+        """某类型题目数量"""
+        return len(self.by_type.get(q_type, ()))
+
+    def counts(self):
+        """各类型题目数量"""
+        return {q_type: len(positions) for q_type, positions in self.by_type.items()}
+
+    def source_questions(self, source):
+        """某个来源文件的全部题目(含与其他文件重复的题目)"""
+        return [self.questions[position] for position in self.by_source.get(source, ())]
+
+    def sources_of(self, position):
+        """某道题的全部来源文件"""
+        ids = [self.first_source[position]] + self.extra_sources.get(position, [])
+        return [self.source_names[source_id] for source_id in ids]
+
+    def conflict_report(self):
+        """答案不一致的重复题目, 每行一题"""
+        lines = []
+        for position, answers in self.conflicts.items():
+            question = self.questions[position]
+            detail = ', '.join(f"{source}: {answer}" for source, answer in answers)
+            lines.append(f"[{question.type}] {question.text.strip()} -- {detail}")
+        return lines
+
+    def sample(self, q_type, k, rng=random):
+        """随机抽取k道某类型的题目(数量不足时全部返回), 耗时与k成正比"""
+        positions = self.by_type.get(q_type)
+        if not positions or k <= 0:
+            return []
+        k = min(k, len(positions))
+        return [self.questions[position] for position in rng.sample(positions, k)]
@@ -0,0 +1,143 @@
+import tkinter as tk
+from tkinter import ttk
+
+# 题目状态对应的 (背景色, 文字颜色)
+STATUS_COLORS = {
+    None: ('#f8f9fa', 'black'),  # 未答
+    True: ('#28a745', 'white'),  # 正确
+    False: ('#dc3545', 'white')  # 错误
+}
+
+
+class QuestionNavigator(ttk.Frame):
+    """题目导航网格
+
+    整个网格画在一个Canvas上, 只为可见的几行创建图形项, 滚动时复用这些
+    图形项并改写坐标和文字, 因此打开耗时和内存与题目数量无关。
+    点击位置通过 cell_at() 换算为题目序号。
+    """
+
+    COLS = 8  # 每行格子数
+    CELL_WIDTH = 80
+    CELL_HEIGHT = 64
+    PAD = 5
+
+    def __init__(self, parent, count, status_of, type_of, on_select, **kwargs):
+        """status_of(i)返回第i题的状态(None/True/False), type_of(i)返回题型, on_select(i)在点击时调用"""
+        super().__init__(parent, **kwargs)
+        self.count = count
+        self.status_of = status_of
+        self.type_of = type_of
+        self.on_select = on_select
+        self.rows = (count + self.COLS - 1) // self.COLS
+        self.offset = 0  # 顶部被卷出的高度(像素)
+        self.cells = []  # 可复用的格子 [(矩形, 序号文字, 题型文字)]
+
+        self.canvas = tk.Canvas(self, bg='#ffffff', highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.yview('scroll', int(-1 * (e.delta / 120)), 'units'))
+        self.canvas.bind("<Button-4>", lambda e: self.yview('scroll', -1, 'units'))
+        self.canvas.bind("<Button-5>", lambda e: self.yview('scroll', 1, 'units'))
+
+    @property
+    def total_height(self):
+        return self.rows * self.CELL_HEIGHT
+
+    def viewport_height(self):
+        return max(self.canvas.winfo_height(), 1)
+
+    def visible_rows(self):
+        """当前可见的行范围"""
+        first = self.offset // self.CELL_HEIGHT
+        last = min(self.rows, (self.offset + self.viewport_height()) // self.CELL_HEIGHT + 1)
+        return range(first, last)
+
+    def cell_at(self, x, y):
+        """点击位置(画布窗口坐标)对应的题目序号, 不在格子上时返回None"""
+        col, dx = divmod(int(x), self.CELL_WIDTH)
+        row, dy = divmod(int(y) + self.offset, self.CELL_HEIGHT)
+        if col >= self.COLS or x < 0 or y < 0:
+            return None
+        if not (self.PAD <= dx < self.CELL_WIDTH - self.PAD and self.PAD <= dy < self.CELL_HEIGHT - self.PAD):
+            return None
+        index = row * self.COLS + col
+        return index if index < self.count else None
+
+    def on_click(self, event):
+        index = self.cell_at(event.x, event.y)
+        if index is not None:
+            self.on_select(index)
+
+    # 滚动
+    def yview(self, *args):
+        """Scrollbar的command, 支持 moveto 和 scroll"""
+        height = self.viewport_height()
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * self.total_height)
+        elif args[0] == 'scroll':
+            step = height if args[2] == 'pages' else self.CELL_HEIGHT
+            offset = self.offset + int(args[1]) * step
+        else:
+            return
+        self.scroll_to(offset)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total_height - self.viewport_height()))
+        if offset != self.offset:
+            self.offset = offset
+            self.redraw()
+
+    def see(self, index):
+        """滚动到第index题所在的行"""
+        top = index // self.COLS * self.CELL_HEIGHT
+        if top < self.offset or top + self.CELL_HEIGHT > self.offset + self.viewport_height():
+            self.scroll_to(top)
+
+    # 绘制
+    def _new_cell(self):
+        canvas = self.canvas
+        return (canvas.create_rectangle(0, 0, 0, 0, outline=''),
+                canvas.create_text(0, 0, font=('Microsoft YaHei', 10)),
+                canvas.create_text(0, 0, font=('Microsoft YaHei', 8)))
+
+    def redraw(self):
+        """按当前滚动位置改写可见格子"""
+        # 窗口大小变化后重新限制滚动位置
+        self.offset = max(0, min(self.offset, self.total_height - self.viewport_height()))
+        rows = self.visible_rows()
+        needed = len(rows) * self.COLS
+        while len(self.cells) < needed:
+            self.cells.append(self._new_cell())
+
+        canvas = self.canvas
+        label_height = 16  # 题型文字占用的高度
+        for slot, cell in enumerate(self.cells):
+            rect, number, q_type = cell
+            index = rows.start * self.COLS + slot
+            if slot >= needed or index >= self.count:
+                for item in cell:
+                    canvas.itemconfigure(item, state='hidden')
+                continue
+            row, col = divmod(index, self.COLS)
+            x0 = col * self.CELL_WIDTH + self.PAD
+            y0 = row * self.CELL_HEIGHT - self.offset + self.PAD
+            x1 = x0 + self.CELL_WIDTH - 2 * self.PAD
+            y1 = y0 + self.CELL_HEIGHT - 2 * self.PAD - label_height
+            bg_color, fg_color = STATUS_COLORS[self.status_of(index)]
+            canvas.coords(rect, x0, y0, x1, y1)
+            canvas.itemconfigure(rect, fill=bg_color, state='normal')
+            canvas.coords(number, (x0 + x1) / 2, (y0 + y1) / 2)
+            canvas.itemconfigure(number, text=str(index + 1), fill=fg_color, state='normal')
+            canvas.coords(q_type, (x0 + x1) / 2, y1 + label_height / 2)
+            canvas.itemconfigure(q_type, text=self.type_of(index)[0], state='normal')  # 显示类型首字
+
+        if self.total_height:
+            self.scrollbar.set(self.offset / self.total_height,
+                               min(1.0, (self.offset + self.viewport_height()) / self.total_height))
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from quiz_metrics import metrics
+
+# 缓存格式版本, 解析逻辑变化时递增使旧缓存失效
+CACHE_VERSION = 7
+
+# 默认缓存目录(与配置文件同级)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.quiz_cache')
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """计算文件内容的哈希值"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_question_types(questions):
+    """统计各类型题目数量"""
+    counts = {'单选题': 0, '多选题': 0, '判断题': 0}
+    for question in questions:
+        if question['type'] in counts:
+            counts[question['type']] += 1
+    return counts
+
+
+def atomic_write(path, data):
+    """先写临时文件再重命名, 保证其他进程不会读到写了一半的文件"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ParseCache:
+    """题库解析结果的磁盘缓存
+
+    index/ 下按文件路径保存 (大小, 修改时间, 内容哈希),
+    objects/ 下按内容哈希保存解析出的题目列表和题型统计。
+    大小和修改时间未变时直接使用记录的哈希; 否则重新计算内容哈希,
+    内容相同(例如仅被touch)时仍然命中缓存。
+    每个条目单独成文件并原子替换, 多个进程可以同时读写。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=2000):
+        self.cache_dir = cache_dir
+        self.index_dir = os.path.join(cache_dir, 'index')
+        self.object_dir = os.path.join(cache_dir, 'objects')
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_prune = 0
+
+    def _ensure_dirs(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        os.makedirs(self.object_dir, exist_ok=True)
+
+    def _index_path(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.index_dir, name + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.object_dir, digest + '.pickle')
+
+    def _read_index(self, path):
+        try:
+            with open(self._index_path(path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def lookup(self, path):
+        """查找缓存
+
+        返回 (payload, token)。未命中时 payload 为 None,
+        解析完成后把 token 原样传给 put()。
+        """
+        st = os.stat(path)
+        entry = self._read_index(path)
+        if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+            digest = entry['digest']
+        else:
+            digest = file_digest(path)
+            if entry and entry.get('digest') != digest:
+                # 文件内容已变化, 旧的解析结果作废
+                self._remove(self._object_path(entry['digest']))
+        token = (st.st_size, st.st_mtime_ns, digest)
+
+        payload = None
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                payload = pickle.load(f)
+            if payload.get('version') != CACHE_VERSION:
+                payload = None
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取解析缓存失败:{e}")
+            self._remove(self._object_path(digest))
+            payload = None
+
+        if payload is None:
+            self.misses += 1
+            metrics.count('parse_cache.miss')
+            return None, token
+
+        if not entry or entry.get('digest') != digest or entry.get('mtime_ns') != st.st_mtime_ns:
+            # 内容未变但文件信息变了, 只更新索引
+            self._write_index(path, token)
+        self.hits += 1
+        metrics.count('parse_cache.hit')
+        return payload, token
+
+    def _write_index(self, path, token):
+        size, mtime_ns, digest = token
+        entry = {
+            'path': os.path.abspath(path),
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'digest': digest
+        }
+        try:
+            self._ensure_dirs()
+            atomic_write(self._index_path(path),
+                         json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            print(f"写入解析缓存索引失败:{e}")
+
+    def put(self, path, token, questions):
+        """保存解析结果"""
+        # 解析期间文件被修改过则不缓存, 避免内容和哈希对不上
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if (st.st_size, st.st_mtime_ns) != token[:2]:
+            return
+
+        payload = {
+            'version': CACHE_VERSION,
+            'questions': questions,
+            'type_counts': count_question_types(questions)
+        }
+        try:
+            self._ensure_dirs()
+            atomic_write(self._object_path(token[2]),
+                         pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"写入解析缓存失败:{e}")
+            return
+        self._write_index(path, token)
+
+        self._puts_since_prune += 1
+        if self._puts_since_prune >= 100:
+            self.prune()
+
+    def prune(self):
+        """清理失效条目
+
+        删除源文件已不存在的索引、不再被引用的解析结果,
+        并在条目超过上限时按最近写入时间淘汰最旧的部分。
+        """
+        self._puts_since_prune = 0
+        if not os.path.isdir(self.index_dir):
+            return
+
+        referenced = set()
+        for name in os.listdir(self.index_dir):
+            index_path = os.path.join(self.index_dir, name)
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._remove(index_path)
+                continue
+            if not os.path.exists(entry.get('path', '')):
+                self._remove(index_path)
+                continue
+            referenced.add(entry['digest'])
+
+        objects = []
+        if not os.path.isdir(self.object_dir):
+            return
+        for entry in os.scandir(self.object_dir):
+            if not entry.name.endswith('.pickle'):
+                continue
+            digest = entry.name[:-len('.pickle')]
+            if digest not in referenced:
+                self._remove(entry.path)
+            else:
+                objects.append((entry.stat().st_mtime, entry.path))
+
+        if len(objects) > self.max_entries:
+            objects.sort()
+            for _, object_path in objects[:len(objects) - self.max_entries]:
+                self._remove(object_path)
+
+    def clear(self):
+        """清空缓存"""
+        for folder in (self.index_dir, self.object_dir):
+            if os.path.isdir(folder):
+                for name in os.listdir(folder):
+                    self._remove(os.path.join(folder, name))
+
+
+_parse_cache = None
+
+
+def get_parse_cache():
+    """获取进程内共享的解析缓存"""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
@@ -1,13 +1,104 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from docx import Document
 import os
-from quiz_reader import QuizReader  # 导入原有的QuizReader类
+from quiz_reader import QuizReader, load_bank_counts  # 导入原有的QuizReader类
+from quiz_cache import get_parse_cache, CACHE_VERSION
+from quiz_question import answer_mask, mask_letters, option_state
+from quiz_store import QuizStore
+from quiz_writer import WriteBehind
+from question_nav import QuestionNavigator
+from option_pool import OptionPool
+from question_index import QuestionIndex
+from near_duplicates import NearDuplicateDetector
+from search_index import SearchIndex
+from bank_scanner import BankScanner
+from quiz_jobs import JobManager
+from quiz_metrics import metrics, enable_from_environment
+from loop_watchdog import LoopWatchdog
+from concurrent.futures import BrokenExecutor, wait, FIRST_COMPLETED
 import re
 import random
-import json
+import sys
 import time
-import hashlib
+
+# 界面线程等待后台写入的最长时间(秒), 超时后先使用数据库中已有的数据
+WRITE_WAIT_TIMEOUT = 0.5
+
+
+def scan_bank_folder(job, executor, scanner, known):
+    """增量扫描题库文件夹, 只在进程池中解析新增或修改的文件(在后台线程中执行)"""
+    diff = scanner.scan(known)
+    job.emit(('diff', diff))
+    files = diff.added + diff.modified
+    metrics.count('scan.files_parsed', len(files))
+    metrics.count('scan.files_unchanged', len(diff.stats) - len(files))
+    
+    # 每个文件单独提交到进程池, 单个文件出错不影响其他文件
+    futures = {executor.submit(load_bank_counts, os.path.join(scanner.folder, file)): file
+               for file in files}
+    pending = set(futures)
+    broken = []  # 因进程池崩溃而未能解析的文件
+    finished = 0
+    try:
+        while pending:
+            job.check_cancelled()
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    job.emit(('file', futures[future], future.result(), None))
+                except BrokenExecutor:
+                    broken.append(futures[future])
+                    continue
+                except Exception as e:
+                    job.emit(('file', futures[future], None, e))
+                finished += 1
+            if done:
+                job.progress(finished, len(files), f"正在解析题库 {finished}/{len(files)}")
+    finally:
+        # 被取消时不再解析剩余文件
+        for future in pending:
+            future.cancel()
+    
+    if broken:
+        # 某个文件使子进程异常退出, 整个进程池随之失效: 通知界面重建进程池,
+        # 受牵连的文件逐个在单独的子进程中重新解析, 只有真正导致崩溃的文件记为失败
+        job.emit(('pool_broken',))
+        for file in sorted(broken):
+            job.check_cancelled()
+            job.emit(('file', file, *parse_in_own_process(os.path.join(scanner.folder, file))))
+            finished += 1
+            job.progress(finished, len(files), f"正在解析题库 {finished}/{len(files)}")
+    
+    # 题库有变化时清理失效的解析缓存(同样在后台线程中, 监视模式下没有变化的扫描不做清理)
+    if files or diff.removed:
+        get_parse_cache().prune()
+
+
+def parse_in_own_process(path):
+    """在单独的子进程中解析一个题库, 返回 (各类型题目数量, 错误)"""
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return executor.submit(load_bank_counts, path).result(), None
+    except BrokenExecutor:
+        return None, RuntimeError("解析时子进程异常退出")
+    except Exception as e:
+        return None, e
+
+
+def build_question_index(job, files, near_duplicate_threshold=0):
+    """加载多个题库并建立题目索引(在后台线程中执行)
+
+    near_duplicate_threshold大于0时同时合并相似度不低于该值的近似重复题目。
+    """
+    detector = NearDuplicateDetector(near_duplicate_threshold) if near_duplicate_threshold else None
+    index = QuestionIndex(near_duplicates=detector)
+    for i, file_path in enumerate(files):
+        job.check_cancelled()
+        index.add_source(os.path.basename(file_path), QuizReader(file_path).questions)
+        job.progress(i + 1, len(files), f"正在加载题目 {i + 1}/{len(files)}")
+    return index
+
 
 class QuizApp:
     def __init__(self, root):
@@ -23,6 +114,20 @@ class QuizApp:
         self.current_mode = None  # normal, exam, review
         self.quiz_dir = None  # 存储选择的题库文件夹路径
         self.quiz_files = []  # 存储选择的题库文件列表
+        self.failed_files = {}  # 解析失败的文件及错误信息
+        self.bank_counts = {}  # 各文件的题型数量 {文件名: {题型: 数量}}
+        self.question_index = None  # 选中题库的题目索引
+        self.question_index_files = ()  # 建立索引时选中的文件
+        self.scanner = None  # 当前文件夹的增量扫描器
+        self.scan_stats = {}  # 最近一次扫描得到的文件信息
+        self.folder_snapshot = None  # 最近一次保存的文件夹摘要
+        self.watch_interval = 0  # 监视模式的检查间隔(秒), 0表示关闭
+        self.watch_timer = None
+        self.near_duplicate_threshold = 0  # 近似重复题目的合并阈值(0-1), 0表示只合并完全相同的题目
+        self.search_index = SearchIndex()  # 全文检索索引, 打开搜索窗口时增量更新
+        self.search_window = None
+        self.search_results = []
+        self.search_timer = None
         self.all_questions = []  # 存储所有题目
         self.available_questions = {  # 存储每种类型的可用题目数量
             '单选题': 0,
@@ -43,25 +148,30 @@ class QuizApp:
         self.exam_timer = None  # 考试计时器
         self.exam_duration = 0  # 考试持续时间(秒)
         
-        # 错题本相关
-        self.wrong_questions = {
-            '单选题': {},  # {question_hash: {'question': question_dict, 'correct_count': 0}}
-            '多选题': {},
-            '判断题': {}
-        }
+        # 题库解析进程池
+        self.ingest_workers = None  # 进程数, None表示使用CPU核数
+        self.ingest_executor = None
+        
+        # 错题本、答题记录和配置保存在SQLite数据库中
+        self.store = None
+        self.writer = None  # 后台写入线程, 所有保存操作都经由它写入数据库
         self.remove_threshold = 2  # 默认做对2次从错题本移除
+        self.open_store()
         
-        # 尝试加载已保存的错题本
-        self.load_wrong_questions_from_json()
+        # 文件选择页和答题页在第一次显示时才创建
+        self.file_select_frame = None
+        self.quiz_frame = None
         
         # 初始化主框架
         self.main_frame = ttk.Frame(self.root, padding="20")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 后台任务及其状态栏
+        self.jobs = JobManager(self.root, on_status=self.update_job_status)
+        self.create_status_bar()
 
         # 创建欢迎页面
         self.create_welcome_page()
-        self.create_file_select_page()
-        self.create_quiz_page()
         
         # 设置样式
         self.style = ttk.Style()
@@ -92,10 +202,110 @@ class QuizApp:
         # 初始显示欢迎页
         self.show_welcome_page()
         
+        # 关闭窗口时释放后台资源
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # 开启性能统计时, Ctrl+Alt+M 打开导出菜单, 同时监视事件循环卡顿
+        self.watchdog = None
+        if metrics.enabled:
+            self.root.bind_all('<Control-Alt-m>', self.show_metrics_menu)
+            self.watchdog = LoopWatchdog(self.root)
+            self.watchdog.start()
+        
         # 添加题库路径保存相关
         self.quiz_dir = None  # 存储选择的题库文件夹路径
-        self.load_last_quiz_dir()  # 加载上次的题库路径
+        self.root.after_idle(self.load_state)  # 窗口显示后再导入旧数据、加载上次的题库路径
+        
+    def on_close(self):
+        """关闭窗口"""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            metrics.gauge('event_loop', self.watchdog.report())
+            print(self.watchdog.summary())
+            self.watchdog = None
+        self.jobs.shutdown()
+        if self.watch_timer is not None:
+            self.root.after_cancel(self.watch_timer)
+            self.watch_timer = None
+        if self.ingest_executor is not None:
+            self.ingest_executor.shutdown(wait=False, cancel_futures=True)
+            self.ingest_executor = None
+        if self.writer is not None:
+            # 写入尚未保存的内容
+            self.writer.close()
+            self.record_writer_metrics()
+            self.writer = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.root.destroy()
+
+    def show_metrics_menu(self, event=None):
+        """性能统计的隐藏菜单"""
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="导出性能统计", command=self.export_metrics)
+        menu.add_command(label="清空性能统计", command=metrics.reset)
+        x = event.x_root if event is not None else self.root.winfo_pointerx()
+        y = event.y_root if event is not None else self.root.winfo_pointery()
+        menu.tk_popup(x, y)
+
+    def export_metrics(self):
+        """把性能统计保存为JSON"""
+        self.record_writer_metrics()
+        if self.watchdog is not None:
+            metrics.gauge('event_loop', self.watchdog.report())
+        path = metrics.dump()
+        if path:
+            messagebox.showinfo("性能统计", f"已保存到 {path}")
+
+    def record_writer_metrics(self):
+        """把后台写入线程的统计记入性能统计"""
+        if metrics.enabled and self.writer is not None:
+            for key, value in self.writer.metrics().items():
+                metrics.gauge('writer.' + key, value)
+
+    def create_status_bar(self):
+        """创建后台任务状态栏(有任务运行时显示)"""
+        self.status_frame = ttk.Frame(self.root, padding=(20, 5))
         
+        self.status_label = ttk.Label(self.status_frame, text="")
+        self.status_label.pack(side=tk.LEFT)
+        
+        self.cancel_job_btn = ttk.Button(self.status_frame, text="取消",
+                                       command=self.jobs.cancel)
+        self.cancel_job_btn.pack(side=tk.RIGHT)
+        
+        self.job_progress = ttk.Progressbar(self.status_frame, length=300)
+        self.job_progress.pack(side=tk.RIGHT, padx=10)
+        self.job_progress_running = False
+
+    def update_job_status(self, job):
+        """刷新状态栏, job为None表示没有正在运行的任务"""
+        if job is None:
+            self.job_progress.stop()
+            self.job_progress_running = False
+            self.status_frame.pack_forget()
+            return
+        
+        if not self.status_frame.winfo_manager():
+            self.status_frame.pack(side=tk.BOTTOM, fill=tk.X, before=self.main_frame)
+        self.status_label.config(text=job.text)
+        
+        if job.total:
+            # 已知总量时显示具体进度
+            if self.job_progress_running:
+                self.job_progress.stop()
+                self.job_progress_running = False
+            self.job_progress.config(mode='determinate', maximum=job.total, value=job.done)
+        elif not self.job_progress_running:
+            self.job_progress.config(mode='indeterminate')
+            self.job_progress.start(10)
+            self.job_progress_running = True
+
+    def on_job_error(self, error):
+        """后台任务出错"""
+        messagebox.showerror("错误", f"加载题库失败:{error}")
+
     def create_welcome_page(self):
         """创建欢迎页面"""
         self.welcome_frame = ttk.Frame(self.main_frame)
@@ -145,6 +355,7 @@ class QuizApp:
         self.file_list.heading('questions', text='题目数量')
         self.file_list.column('name', width=300, anchor='w')
         self.file_list.column('questions', width=300, anchor='w')
+        self.file_list.tag_configure('error', foreground='#dc3545')
         
         # 添加滚动条
         y_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL,
@@ -195,13 +406,39 @@ class QuizApp:
                                 state='disabled')
         self.exam_btn.pack(side=tk.LEFT, padx=10)
         
-        # 错题重做按钮
-        total_wrong = sum(len(questions) for questions in self.wrong_questions.values())
+        # 错题重做按钮(显示页面时更新错题数量)
         self.review_btn = ttk.Button(button_frame,
-                                   text=f"错题重做({total_wrong}题)",
+                                   text="错题重做",
                                    command=self.show_wrong_questions_config,
-                                   state='normal' if total_wrong > 0 else 'disabled')
+                                   state='disabled')
         self.review_btn.pack(side=tk.LEFT, padx=10)
+        
+        # 搜索按钮
+        search_btn = ttk.Button(button_frame,
+                              text="搜索题目",
+                              command=self.show_search_window)
+        search_btn.pack(side=tk.LEFT, padx=10)
+        
+        # 设置按钮
+        settings_btn = ttk.Button(button_frame,
+                                text="设置",
+                                command=self.show_settings_window)
+        settings_btn.pack(side=tk.LEFT, padx=10)
+
+    def flush_writes(self):
+        """等待后台写入完成(最多WRITE_WAIT_TIMEOUT秒), 超时时返回False, 调用方读到的可能是稍旧的数据"""
+        if self.writer.flush(timeout=WRITE_WAIT_TIMEOUT):
+            return True
+        print(f"后台写入超过{WRITE_WAIT_TIMEOUT}秒仍未完成, 先显示已保存的数据")
+        return False
+
+    def update_review_button(self):
+        """更新错题重做按钮上的错题数量"""
+        self.flush_writes()
+        total_wrong = sum(self.store.wrong_counts().values())
+        total_due = sum(self.store.due_counts().values())
+        self.review_btn.config(text=f"错题重做(到期{total_due}/共{total_wrong}题)",
+                               state='normal' if total_wrong > 0 else 'disabled')
 
     def select_all_files(self):
         """全选文件列表中的所有文件"""
@@ -221,15 +458,17 @@ class QuizApp:
 
     def show_exam_config(self):
         """显示考试配置窗口"""
+        # 统计所有可用题目, 完成后再打开配置窗口
+        self.count_available_questions(on_done=self.open_exam_config)
+
+    def open_exam_config(self):
+        """创建考试配置窗口"""
         # 创建配置窗口
         config_window = tk.Toplevel(self.root)
         config_window.title("考试模式配置")
         config_window.geometry("400x500")
         config_window.transient(self.root)  # 设置为主窗口的子窗口
         
-        # 统计所有可用题目
-        self.count_available_questions()
-        
         # 加载上次考试配置
         last_config = self.load_last_exam_config()
         
@@ -275,43 +514,148 @@ class QuizApp:
 
     def load_last_exam_config(self):
         """加载上次考试配置"""
+        config = {'单选题': 0, '多选题': 0, '判断题': 0}
         try:
-            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exam_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            # 尚未写入数据库的配置直接从写入队列读取
+            pending = self.writer.pending_args(('config', 'exam_config'))
+            config.update(pending[1] if pending else self.store.get_config('exam_config', {}))
         except Exception as e:
             print(f"Error loading exam config: {str(e)}")
-        return {'单选题': 0, '多选题': 0, '判断题': 0}
+        return config
 
     def save_exam_config(self, config):
         """保存考试配置"""
         try:
-            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exam_config.json')
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            self.writer.submit(('config', 'exam_config'), QuizStore.set_config, 'exam_config', config)
         except Exception as e:
             print(f"Error saving exam config: {str(e)}")
 
-    def count_available_questions(self):
+    def show_settings_window(self):
+        """显示设置窗口(解析进程数、监视间隔、近似重复阈值)"""
+        settings_window = tk.Toplevel(self.root)
+        settings_window.title("设置")
+        settings_window.geometry("400x300")
+        settings_window.transient(self.root)
+        
+        settings_frame = ttk.Frame(settings_window, padding="20")
+        settings_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 每项设置: (标签, 当前值, 取值范围, 步长), 0表示使用默认值或关闭
+        fields = (
+            ('ingest_workers', "解析进程数(0为CPU核数):", self.ingest_workers or 0, 0, 64, 1),
+            ('watch_interval', "监视间隔(秒, 0为关闭):", self.watch_interval, 0, 3600, 1),
+            ('near_duplicate_threshold', "近似重复阈值(0-1, 0为关闭):", self.near_duplicate_threshold, 0, 1, 0.05),
+        )
+        setting_vars = {}
+        for name, label, value, low, high, step in fields:
+            row = ttk.Frame(settings_frame)
+            row.pack(fill='x', pady=10)
+            ttk.Label(row, text=label).pack(side=tk.LEFT)
+            var = tk.StringVar(value=str(value))
+            ttk.Spinbox(row, from_=low, to=high, increment=step,
+                        width=6, textvariable=var).pack(side=tk.RIGHT)
+            setting_vars[name] = var
+        
+        ttk.Button(settings_frame,
+                  text="保存",
+                  command=lambda: self.apply_settings(setting_vars, settings_window)).pack(pady=20)
+        
+        settings_window.grab_set()
+        settings_window.focus_set()
+
+    def apply_settings(self, setting_vars, settings_window):
+        """检查并保存设置"""
+        try:
+            workers = int(setting_vars['ingest_workers'].get())
+            interval = float(setting_vars['watch_interval'].get())
+            threshold = float(setting_vars['near_duplicate_threshold'].get())
+            if workers < 0 or interval < 0 or not 0 <= threshold <= 1:
+                raise ValueError("超出取值范围")
+        except ValueError as e:
+            messagebox.showerror("错误", f"设置无效:{e}", parent=settings_window)
+            return
+        
+        workers = workers or None
+        if workers != self.ingest_workers:
+            # 新的进程数在下次扫描时生效
+            self.ingest_workers = workers
+            if self.ingest_executor is not None:
+                self.ingest_executor.shutdown(wait=False)
+                self.ingest_executor = None
+        if threshold != self.near_duplicate_threshold:
+            # 题目索引按阈值合并重复题目, 阈值改变后重新建立
+            self.near_duplicate_threshold = threshold
+            self.question_index = None
+            self.question_index_files = ()
+        self.watch_interval = interval
+        if self.watch_timer is not None:
+            self.root.after_cancel(self.watch_timer)
+            self.watch_timer = None
+        if self.watch_interval and self.quiz_dir:
+            self.watch_timer = self.root.after(int(self.watch_interval * 1000), self.watch_quiz_dir)
+        
+        self.save_quiz_dir()
+        settings_window.destroy()
+
+    def count_available_questions(self, on_done=None):
         """统计所有可用题目"""
-        self.all_questions = []  # 清空之前的题目
+        selected_files = self.get_selected_files()
         self.available_questions = {'单选题': 0, '多选题': 0, '判断题': 0}
         
-        # 获取选中的文件
-        selected_indices = self.file_list.selection()
-        for idx in selected_indices:
-            file_name = self.file_list.item(idx)['values'][0]
-            file_path = os.path.join(self.quiz_dir, file_name)
-            
-            # 加载题目
-            temp_quiz = QuizReader(file_path)
-            self.all_questions.extend(temp_quiz.questions)
-            
-            # 统计各类型题目数量
-            for question in temp_quiz.questions:
-                if question['type'] in self.available_questions:
-                    self.available_questions[question['type']] += 1
+        if self.question_index is not None and self.question_index_files == tuple(selected_files):
+            # 已为当前选择建立过索引
+            self.available_questions.update(self.question_index.counts())
+        elif len(selected_files) == 1 and os.path.basename(selected_files[0]) in self.bank_counts:
+            # 只选了一个文件时直接使用扫描时得到的题型数量, 无需加载题目
+            for file_path in selected_files:
+                for q_type, count in self.bank_counts[os.path.basename(file_path)].items():
+                    if q_type in self.available_questions:
+                        self.available_questions[q_type] += count
+        else:
+            # 多个题库之间可能有重复题目(或仍有文件未解析完), 在后台建立去重索引后再统计
+            def finish(index):
+                self.available_questions.update(index.counts())
+                if on_done:
+                    on_done()
+            self.with_question_index(selected_files, finish, "正在统计题目")
+            return
+        
+        if on_done:
+            on_done()
+
+    def with_question_index(self, files, on_ready, name):
+        """获取所选题库的题目索引, 未建立时在后台加载后回调on_ready(index)"""
+        files = tuple(files)
+        if self.question_index is not None and self.question_index_files == files:
+            on_ready(self.question_index)
+            return
+        
+        def finish(index):
+            self.question_index = index
+            self.question_index_files = files
+            self.all_questions = index.questions
+            self.report_duplicate_questions(index)
+            on_ready(index)
+        
+        self.jobs.submit('session', build_question_index, files, self.near_duplicate_threshold,
+                         name=name, on_done=finish, on_error=self.on_job_error)
+
+    def report_duplicate_questions(self, index):
+        """提示所选题库之间的重复题目和答案冲突"""
+        if index.duplicates:
+            print(f"所选题库中有 {index.duplicates} 道重复题目, 已合并")
+        if not index.conflicts:
+            return
+        report = index.conflict_report()
+        print("答案不一致的重复题目:")
+        for line in report:
+            print(f"  {line}")
+        shown = report[:5]
+        if len(report) > len(shown):
+            shown.append(f"……共{len(report)}题")
+        messagebox.showwarning("答案冲突",
+                               f"以下题目在不同题库中的答案不一致(已保留第一个题库中的答案):\n\n"
+                               + "\n\n".join(shown))
 
     def start_exam(self, spinbox_vars, config_window):
         """开始考试模式"""
@@ -330,17 +674,17 @@ class QuizApp:
             messagebox.showwarning("警告", "请至少选择一道题目!")
             return
         
-        # 按类型和顺序选择题目
-        selected_questions = []
-        for q_type in self.question_type_order:  # 按固定顺序添加题目
-            count = selected_counts[q_type]
-            if count > 0:
-                # 获取该类型的所有题目
-                type_questions = [q for q in self.all_questions if q['type'] == q_type]
-                # 随机选择指定数量的题目
-                selected = random.sample(type_questions, min(count, len(type_questions)))
-                selected_questions.extend(selected)
+        def sample(index):
+            # 按类型和顺序从索引中随机抽取题目
+            selected_questions = []
+            for q_type in self.question_type_order:  # 按固定顺序添加题目
+                selected_questions.extend(index.sample(q_type, selected_counts[q_type]))
+            self.begin_exam(selected_questions, config_window)
         
+        self.with_question_index(self.get_selected_files(), sample, "正在加载题目")
+
+    def begin_exam(self, selected_questions, config_window):
+        """用抽取的题目开始考试"""
         # 创建新的QuizReader实例
         self.quiz = QuizReader(None)
         self.quiz.questions = selected_questions
@@ -356,13 +700,15 @@ class QuizApp:
         self.question_feedback = {}
         self.question_status = {}
         
-        # 开始计时
+        # 开始计时(计时显示在答题页上)
+        self.ensure_quiz_page()
         self.exam_start_time = time.time()
         self.exam_duration = 0
         self.update_exam_timer()
         
         # 关闭配置窗口
-        config_window.destroy()
+        if config_window.winfo_exists():
+            config_window.destroy()
         
         # 显示答题页面
         self.show_quiz_page()
@@ -426,7 +772,10 @@ class QuizApp:
         options_frame = ttk.LabelFrame(content_frame, text="选择答案", padding=15)
         options_frame.grid(row=1, column=0, sticky="nsew", pady=(0, 15))
         
-        self.option_var = tk.StringVar()
+        # 选项控件在切换题目时复用
+        self.option_pool = OptionPool(options_frame)
+        self.option_var = self.option_pool.radio_var
+        self.option_vars = []
         self.option_buttons = []
         self.options_frame = options_frame
         
@@ -493,64 +842,222 @@ class QuizApp:
             self.save_quiz_dir()  # 保存新选择的路径
             self.load_quiz_files()
 
-    def load_quiz_files(self):
-        """加载文件夹中的题库文件"""
-        # 清空文件列表
-        for item in self.file_list.get_children():
-            self.file_list.delete(item)
-        
-        # 获取文件夹中的所有.docx文件
-        self.quiz_files = []
-        for file in os.listdir(self.quiz_dir):
-            if file.endswith('.docx'):
-                file_path = os.path.join(self.quiz_dir, file)
-                # 临时加载文件获取题目数量
-                temp_quiz = QuizReader(file_path)
-                
-                # 获取各类型题目数量
-                type_counts = self.get_question_type_counts(temp_quiz.questions)
-                total_count = sum(type_counts.values())
-                
-                # 格式化题目统计信息
-                type_info = []
-                if type_counts['单选题'] > 0:
-                    type_info.append(f"单选题:{type_counts['单选题']}")
-                if type_counts['多选题'] > 0:
-                    type_info.append(f"多选题:{type_counts['多选题']}")
-                if type_counts['判断题'] > 0:
-                    type_info.append(f"判断题:{type_counts['判断题']}")
-                
-                questions_info = f"{total_count}题 ({', '.join(type_info)})"
-                
-                # 添加到列表
-                self.quiz_files.append(file_path)
-                self.file_list.insert('', 'end', values=(file, questions_info))
+    def load_quiz_files(self, silent=False):
+        """加载文件夹中的题库文件
+
+        同一文件夹再次加载时只解析新增或修改过的文件, 并逐行更新列表。
+        """
+        if self.scanner is None or self.scanner.folder != self.quiz_dir:
+            # 换了文件夹, 清空文件列表
+            self.reset_file_list()
         
         # 绑定选择事件
         self.file_list.bind('<<TreeviewSelect>>', self.on_file_select)
+        
+        # 在后台扫描并解析有变化的题库, 结果逐行填入列表;
+        # 重新选择文件夹时新的扫描会取代尚未完成的扫描
+        self.jobs.submit('scan', scan_bank_folder, self.get_ingest_executor(),
+                         self.scanner, dict(self.scanner.manifest),
+                         name="正在扫描题库", silent=silent,
+                         on_item=self.on_scan_item,
+                         on_done=self.on_scan_done,
+                         on_error=lambda e: print(f"读取文件夹失败:{e}") if silent
+                         else messagebox.showerror("错误", f"读取文件夹失败:{e}"),
+                         on_cancel=self.on_scan_cancelled)
+        
+        # 开启了监视模式时定期检查文件夹变化
+        if self.watch_interval and self.watch_timer is None:
+            self.watch_timer = self.root.after(int(self.watch_interval * 1000), self.watch_quiz_dir)
 
-    def start_quiz(self, mode):
-        """开始答题"""
-        selected_indices = self.file_list.selection()
-        if not selected_indices:
+    def reset_file_list(self):
+        """清空文件列表和已有的解析结果, 为当前文件夹新建扫描器"""
+        self.ensure_file_select_page()
+        for item in self.file_list.get_children():
+            self.file_list.delete(item)
+        self.quiz_files = []
+        self.failed_files = {}
+        self.bank_counts = {}
+        self.question_index = None
+        self.question_index_files = ()
+        self.scanner = BankScanner(self.quiz_dir)
+
+    def restore_folder_snapshot(self):
+        """立即显示上次保存的文件夹摘要, 返回是否显示
+
+        摘要中的文件按保存时的大小和修改时间记入扫描器的清单, 随后的增量扫描
+        只重新解析有变化的文件, 逐行更新列表。摘要中的题型数量由保存时的解析器
+        得出, 解析缓存版本不同时不使用, 全部重新解析。
+        """
+        snapshot = self.store.get_config('folder_snapshot')
+        if not snapshot or snapshot.get('folder') != self.quiz_dir:
+            return False
+        if snapshot.get('version') != CACHE_VERSION:
+            return False
+        self.reset_file_list()
+        for file, size, mtime, type_counts, error in snapshot['files']:
+            self.scanner.record(file, (size, mtime))
+            if error is None:
+                self.quiz_files.append(os.path.join(self.quiz_dir, file))
+                self.bank_counts[file] = type_counts
+                self.file_list.insert('', 'end', iid=file, values=(file, self.format_type_counts(type_counts)))
+            else:
+                self.failed_files[file] = error
+                self.file_list.insert('', 'end', iid=file, values=(file, f"解析失败:{error}"), tags=('error',))
+        self.scan_stats = dict(self.scanner.manifest)
+        self.folder_snapshot = snapshot
+        return True
+
+    def save_folder_snapshot(self):
+        """保存当前文件夹的摘要(解析缓存版本, 按列表顺序的文件名、大小、修改时间和题型数量), 无变化时不保存"""
+        files = []
+        for file in self.file_list.get_children():
+            stat = self.scanner.manifest.get(file)
+            if stat is None:
+                continue  # 尚未解析完成
+            if file in self.bank_counts:
+                files.append([file, stat[0], stat[1], self.bank_counts[file], None])
+            elif file in self.failed_files:
+                files.append([file, stat[0], stat[1], None, self.failed_files[file]])
+        snapshot = {'version': CACHE_VERSION, 'folder': self.scanner.folder, 'files': files}
+        if snapshot != self.folder_snapshot:
+            self.folder_snapshot = snapshot
+            self.writer.submit(('config', 'folder_snapshot'), QuizStore.set_config, 'folder_snapshot', snapshot)
+
+    def on_scan_done(self, _):
+        """扫描完成: 保存文件夹摘要"""
+        try:
+            self.save_folder_snapshot()
+        except Exception as e:
+            print(f"保存文件夹摘要时出错:{e}")
+
+    def watch_quiz_dir(self):
+        """监视模式: 定期增量扫描, 发现打开期间被修改的题库"""
+        self.watch_timer = None
+        if self.quiz_dir and os.path.isdir(self.quiz_dir) and not self.jobs.is_busy('scan'):
+            self.load_quiz_files(silent=True)
+        elif self.watch_interval:
+            self.watch_timer = self.root.after(int(self.watch_interval * 1000), self.watch_quiz_dir)
+
+    def get_ingest_executor(self):
+        """获取(必要时创建)解析题库用的进程池"""
+        if self.ingest_executor is None:
+            # 进程池会导入multiprocessing, 第一次扫描时再导入以加快启动
+            from concurrent.futures import ProcessPoolExecutor
+            self.ingest_executor = ProcessPoolExecutor(max_workers=self.ingest_workers)
+        return self.ingest_executor
+
+    def on_scan_item(self, item):
+        """处理扫描任务发回的结果"""
+        if item[0] == 'diff':
+            self.apply_scan_diff(item[1])
+            return
+        if item[0] == 'pool_broken':
+            # 子进程异常退出, 进程池已不可用, 下次扫描时重建
+            self.ingest_executor = None
             return
         
-        # 获取选中的文件路径
+        _, file, type_counts, error = item
+        if not self.file_list.exists(file):
+            return
+        if isinstance(error, BrokenExecutor):
+            # 不是文件本身的问题, 不记入清单(也不进入文件夹摘要), 下次扫描时重新解析
+            self.ingest_executor = None
+            self.file_list.item(file, values=(file, f"解析失败:{error}"), tags=('error',))
+            return
+        # 无论成功与否都记入清单, 文件未再修改时不再重复解析
+        self.scanner.record(file, self.scan_stats[file])
+        if error is not None:
+            self.mark_file_failed(file, error)
+            return
+        
+        self.quiz_files.append(os.path.join(self.quiz_dir, file))
+        self.bank_counts[file] = type_counts
+        self.file_list.item(file, values=(file, self.format_type_counts(type_counts)), tags=())
+
+    def apply_scan_diff(self, diff):
+        """按扫描结果逐行更新文件列表"""
+        self.scan_stats = diff.stats
+        if diff.added or diff.modified or diff.removed:
+            self.question_index = None  # 题库有变化, 索引需重建
+            self.question_index_files = ()
+        
+        # 删除已不存在的文件
+        for file in diff.removed:
+            self.scanner.forget(file)
+            self.forget_file(file)
+            if self.file_list.exists(file):
+                self.file_list.delete(file)
+        
+        # 新增和修改的文件等待解析完成后填入题目数量
+        for file in diff.added + diff.modified:
+            self.forget_file(file)
+            if self.file_list.exists(file):
+                self.file_list.item(file, values=(file, "解析中..."), tags=())
+            else:
+                self.file_list.insert('', 'end', iid=file, values=(file, "解析中..."))
+
+    def forget_file(self, file):
+        """清除一个文件已有的解析结果"""
+        file_path = os.path.join(self.quiz_dir, file)
+        if file_path in self.quiz_files:
+            self.quiz_files.remove(file_path)
+        self.bank_counts.pop(file, None)
+        self.failed_files.pop(file, None)
+
+    def on_scan_cancelled(self):
+        """扫描被取消, 标记未解析的文件"""
+        for item in self.file_list.get_children():
+            values = self.file_list.item(item)['values']
+            if values[1] == "解析中...":
+                self.file_list.item(item, values=(values[0], "已取消"))
+
+    def mark_file_failed(self, file, error):
+        """将解析失败的文件标记为错误行"""
+        print(f"读取文件 {file} 时出错:{error}")
+        self.failed_files[file] = str(error)
+        self.file_list.item(file, values=(file, f"解析失败:{error}"), tags=('error',))
+        self.file_list.selection_remove(file)
+
+    def format_type_counts(self, type_counts):
+        """格式化题目统计信息"""
+        total_count = sum(type_counts.values())
+        type_info = []
+        if type_counts['单选题'] > 0:
+            type_info.append(f"单选题:{type_counts['单选题']}")
+        if type_counts['多选题'] > 0:
+            type_info.append(f"多选题:{type_counts['多选题']}")
+        if type_counts['判断题'] > 0:
+            type_info.append(f"判断题:{type_counts['判断题']}")
+        return f"{total_count}题 ({', '.join(type_info)})"
+
+    def get_selected_files(self):
+        """获取选中且可用的题库文件路径"""
         selected_files = []
-        for idx in selected_indices:
+        for idx in self.file_list.selection():
             file_name = self.file_list.item(idx)['values'][0]
-            file_path = os.path.join(self.quiz_dir, file_name)
-            selected_files.append(file_path)
+            if file_name in self.failed_files:
+                continue
+            selected_files.append(os.path.join(self.quiz_dir, file_name))
+        return selected_files
+
+    def start_quiz(self, mode):
+        """开始答题"""
+        # 获取选中的文件路径
+        selected_files = self.get_selected_files()
+        if not selected_files:
+            return
         
         # 合并所有选中文件的题目
-        all_questions = []
-        for file_path in selected_files:
-            temp_quiz = QuizReader(file_path)
-            all_questions.extend(temp_quiz.questions)
-        
+        self.with_question_index(selected_files,
+                                 lambda index: self.begin_quiz(mode, list(index.questions)),
+                                 "正在加载题目")
+
+    def begin_quiz(self, mode, all_questions):
+        """用合并后的题目开始答题"""
         # 创建新的QuizReader实例
-        self.quiz = QuizReader(selected_files[0])  # 使用第一个文件初始化
+        self.quiz = QuizReader(None)
         self.quiz.questions = all_questions  # 替换为合并后的题目
+        self.quiz.total_score = len(all_questions)
         self.quiz.current_question = 0
         self.quiz.score = 0
         self.quiz.wrong_questions = []  # 重置错题列表
@@ -567,10 +1074,22 @@ class QuizApp:
         self.show_quiz_page()
         self.display_question()
 
+    def ensure_file_select_page(self):
+        """第一次用到文件选择页时创建"""
+        if self.file_select_frame is None:
+            self.create_file_select_page()
+
+    def ensure_quiz_page(self):
+        """第一次用到答题页时创建"""
+        if self.quiz_frame is None:
+            self.create_quiz_page()
+
     def show_welcome_page(self):
         """显示欢迎页面"""
-        self.quiz_frame.pack_forget() if hasattr(self, 'quiz_frame') else None
-        self.file_select_frame.pack_forget() if hasattr(self, 'file_select_frame') else None
+        if self.quiz_frame is not None:
+            self.quiz_frame.pack_forget()
+        if self.file_select_frame is not None:
+            self.file_select_frame.pack_forget()
         self.welcome_frame.pack(fill=tk.BOTH, expand=True)
         
         # 停止计时器
@@ -581,14 +1100,19 @@ class QuizApp:
 
     def show_file_select_page(self):
         """显示文件选择页面"""
+        self.ensure_file_select_page()
+        self.update_review_button()
         self.welcome_frame.pack_forget()
-        self.quiz_frame.pack_forget() if hasattr(self, 'quiz_frame') else None
+        if self.quiz_frame is not None:
+            self.quiz_frame.pack_forget()
         self.file_select_frame.pack(fill=tk.BOTH, expand=True)
 
     def show_quiz_page(self):
         """显示答题页面"""
+        self.ensure_quiz_page()
         self.welcome_frame.pack_forget()
-        self.file_select_frame.pack_forget()
+        if self.file_select_frame is not None:
+            self.file_select_frame.pack_forget()
         self.quiz_frame.pack(fill=tk.BOTH, expand=True)
         
     def display_question(self):
@@ -618,60 +1142,22 @@ class QuizApp:
         self.question_text.delete('1.0', tk.END)
         self.question_text.insert('1.0', question_text)
         
-        # 清除旧选项和框架
-        for widget in self.options_frame.winfo_children():
-            widget.destroy()
-        self.option_buttons.clear()
-        
-        # 创建新选项
+        # 改写复用的选项控件(单选/判断用单选框, 多选用复选框)
         if question['type'] == "判断题":
             options = [('T', '对'), ('F', '错')]
-            self.option_var = tk.StringVar()  # 单选
-            widget_class = ttk.Radiobutton
-        elif question['type'] == "多选题":
-            options = [(opt[0], opt) for opt in question['options']]
-            self.option_vars = []  # 多选用多个变量
-            widget_class = ttk.Checkbutton
-        else:  # 单选题
+        else:
             options = [(opt[0], opt) for opt in question['options']]
-            self.option_var = tk.StringVar()  # 单选
-            widget_class = ttk.Radiobutton
-            
-        # 创建选项框架
-        options_inner_frame = ttk.Frame(self.options_frame)
-        options_inner_frame.pack(fill="both", expand=True, padx=20, pady=10)
-            
-        for i, (value, text) in enumerate(options):
-            if question['type'] == "多选题":
-                var = tk.BooleanVar()
-                self.option_vars.append(var)
-                btn = widget_class(
-                    options_inner_frame,
-                    text=text.strip(),
-                    variable=var,
-                    style="TCheckbutton"
-                )
-                # 保存选项值用于后续判断
-                btn.option_value = value
-            else:
-                btn = widget_class(
-                    options_inner_frame,
-                    text=text.strip(),
-                    value=value,
-                    variable=self.option_var,
-                    style="TRadiobutton"
-                )
-            btn.pack(anchor="w", pady=8)
-            self.option_buttons.append(btn)
+        self.option_buttons = self.option_pool.show(options, question['type'] == "多选题")
+        self.option_vars = self.option_pool.vars(len(options))
         
         # 恢复之前的答案和反馈(如果有)
         question_id = f"{self.current_mode}_{self.quiz.current_question}"
         if question_id in self.answered_questions:
             # 恢复选择的答案
+            selected = answer_mask(self.answered_questions[question_id])
             if question['type'] == "多选题":
-                selected_answers = self.answered_questions[question_id]
                 for i, var in enumerate(self.option_vars):
-                    var.set(options[i][0] in selected_answers)
+                    var.set(bool(answer_mask(options[i][0]) & selected))
             else:
                 self.option_var.set(self.answered_questions[question_id])
             
@@ -684,20 +1170,7 @@ class QuizApp:
                 self.feedback_text.configure(foreground='green' if self.question_status[question_id] else 'red')
                 
                 # 恢复选项颜色
-                correct_answer = question['answer'].upper()
-                if question['type'] == "多选题":
-                    correct_answers = ''.join(c for c in correct_answer if c.isalpha())
-                    for btn in self.option_buttons:
-                        if btn.option_value in correct_answers:
-                            btn.configure(style="Correct.TCheckbutton")
-                        elif btn.option_value in selected_answers and btn.option_value not in correct_answers:
-                            btn.configure(style="Wrong.TCheckbutton")
-                else:
-                    for btn in self.option_buttons:
-                        if btn.cget('value') == correct_answer:
-                            btn.configure(style="Correct.TRadiobutton")
-                        elif btn.cget('value') == self.answered_questions[question_id] and btn.cget('value') != correct_answer:
-                            btn.configure(style="Wrong.TRadiobutton")
+                self.color_options(question, selected)
         else:
             # 重置选择
             if question['type'] == "多选题":
@@ -799,88 +1272,39 @@ class QuizApp:
             question = self.quiz.questions[self.quiz.current_question]
             total = len(self.quiz.questions)
             
-        # 获取答案
+        # 获取答案(编码为位掩码, 与选择顺序无关)
         if question['type'] == "多选题":
-            # 收集所有选中的选项
-            selected_values = []
-            for i, var in enumerate(self.option_vars):
+            selected = 0
+            for btn, var in zip(self.option_buttons, self.option_vars):
                 if var.get():
-                    selected_values.append(question['options'][i][0])
-            
-            if not selected_values:
+                    selected |= answer_mask(btn.option_value)
+            if not selected:
                 messagebox.showwarning("警告", "请至少选择一个选项!")
                 return
-                
-            # 对选中的选项排序
-            selected_values.sort()
-            answer = ''.join(selected_values)  # 多选题答案直接连接,不使用逗号
-            
-            # 处理正确答案,移除所有空格和逗号
-            correct_answer = ''.join(c for c in question['answer'].upper() if c.isalpha())
         else:
-            answer = self.option_var.get()
-            if not answer:
+            if not self.option_var.get():
                 messagebox.showwarning("警告", "请选择一个答案!")
                 return
-            correct_answer = question['answer'].upper()
+            selected = answer_mask(self.option_var.get())
+        answer = mask_letters(selected)  # 按字母顺序排列, 不使用分隔符
+        correct = question.answer_mask
 
         # 检查答案
-        is_correct = answer.upper() == correct_answer
+        is_correct = selected == correct
 
         # 更新选项颜色
-        if question['type'] == "多选题":
-            for btn in self.option_buttons:
-                if btn.option_value in correct_answer:
-                    btn.configure(style="Correct.TCheckbutton")
-                elif btn.option_value in answer and btn.option_value not in correct_answer:
-                    btn.configure(style="Wrong.TCheckbutton")
-                else:
-                    btn.configure(style="TCheckbutton")
-        else:
-            for btn in self.option_buttons:
-                if btn.cget('value') == correct_answer:
-                    btn.configure(style="Correct.TRadiobutton")
-                elif btn.cget('value') == answer and btn.cget('value') != correct_answer:
-                    btn.configure(style="Wrong.TRadiobutton")
-                else:
-                    btn.configure(style="TRadiobutton")
+        self.color_options(question, selected)
 
         # 获取选项文本
         if question['type'] == "判断题":
             selected_text = "对" if answer == "T" else "错"
-            correct_text = "对" if correct_answer == "T" else "错"
-        elif question['type'] == "多选题":
-            # 获取选中的选项文本
-            selected_text = []
-            correct_text = []
-            
-            # 处理用户选择的答案
-            for opt in question['options']:
-                if opt[0] in answer:
-                    # 提取选项内容(去掉选项标记和点)
-                    opt_content = re.sub(r'^[A-Z][.、\s]', '', opt).strip()
-                    selected_text.append(f"{opt[0]}. {opt_content}")
-                    
-            # 处理正确答案
-            for opt in question['options']:
-                if opt[0] in correct_answer:
-                    # 提取选项内容(去掉选项标记和点)
-                    opt_content = re.sub(r'^[A-Z][.、\s]', '', opt).strip()
-                    correct_text.append(f"{opt[0]}. {opt_content}")
-                    
-            selected_text = "\n".join(selected_text)  # 每个选项单独一行
-            correct_text = "\n".join(correct_text)    # 每个选项单独一行
+            correct_text = "对" if question.answer == "T" else "错"
         else:
-            # 提取选项内容(去掉选项标记和点)
-            selected_text = ""
-            correct_text = ""
-            for opt in question['options']:
-                if opt.startswith(answer):
-                    selected_text = re.sub(r'^[A-Z][.、\s]', '', opt).strip()
-                    selected_text = f"{opt[0]}. {selected_text}"
-                if opt.startswith(correct_answer):
-                    correct_text = re.sub(r'^[A-Z][.、\s]', '', opt).strip()
-                    correct_text = f"{opt[0]}. {correct_text}"
+            # 选项在解析时已拆分为(标记, 内容), 每个选项单独一行
+            selected_text = "\n".join(f"{label}. {text}" for label, text in question.choices
+                                      if answer_mask(label) & selected)
+            correct_text = "\n".join(f"{label}. {text}" for label, text in question.choices
+                                     if answer_mask(label) & correct)
         
         # 更新分数和错题本
         if is_correct:
@@ -920,29 +1344,21 @@ class QuizApp:
         # 更新分数显示
         self.score_label.config(text=f"当前得分:{self.quiz.score}/{total}")
         
-        # 更新错题本
-        if self.current_mode == "normal":  # 只在练习模式下记录错题
-            question_hash = self.get_question_hash(question)
-            if is_correct:
-                # 如果在错题本中且答对了,增加正确次数
-                if question['type'] in self.wrong_questions and \
-                   question_hash in self.wrong_questions[question['type']]:
-                    self.wrong_questions[question['type']][question_hash]['correct_count'] += 1
-                    # 检查是否达到移除阈值
-                    if self.wrong_questions[question['type']][question_hash]['correct_count'] >= self.remove_threshold:
-                        del self.wrong_questions[question['type']][question_hash]
-            else:
-                # 答错了,添加到错题本或重置正确次数
-                if question_hash not in self.wrong_questions[question['type']]:
-                    self.wrong_questions[question['type']][question_hash] = {
-                        'question': question,
-                        'correct_count': 0
-                    }
-                else:
-                    self.wrong_questions[question['type']][question_hash]['correct_count'] = 0
-            
-            # 保存错题本
-            self.save_wrong_questions()
+        # 记录作答(由后台线程写入), 练习和错题重做时更新错题本和复习进度
+        try:
+            self.writer.submit(None, QuizStore.record_answer,
+                               question, answer, is_correct, self.current_mode,
+                               self.remove_threshold if self.current_mode in ("normal", "review") else None)
+        except Exception as e:
+            print(f"保存答题记录时出错:{e}")
+
+    def color_options(self, question, selected):
+        """按位掩码标记选项: 正确选项为绿色, 选错的选项为红色"""
+        style = "TCheckbutton" if question['type'] == "多选题" else "TRadiobutton"
+        prefixes = {'correct': "Correct.", 'wrong': "Wrong.", None: ""}
+        for btn in self.option_buttons:
+            state = option_state(answer_mask(btn.option_value), selected, question.answer_mask)
+            btn.configure(style=prefixes[state] + style)
 
     def show_quiz_complete(self):
         """显示测验完成信息"""
@@ -1016,81 +1432,21 @@ class QuizApp:
                      text=f"共{total}题 ({', '.join(stats)})",
                      style="Score.TLabel").pack(side=tk.RIGHT)
         
-        # 创建滚动区域
-        canvas = tk.Canvas(main_frame, bg='#ffffff')
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", 
-                                command=canvas.yview)
-        
-        # 创建网格框架
-        self.grid_frame = ttk.Frame(canvas)
-        
-        # 配置画布
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # 打包滚动组件
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # 创建窗口
-        canvas.create_window((0, 0), window=self.grid_frame, anchor="nw")
-        
-        # 创建题目按钮网格
-        self.create_question_grid()
-        
-        # 更新滚动区域
-        self.grid_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
-        
-        # 绑定鼠标滚轮
-        canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(
-            int(-1*(e.delta/120)), "units"))
+        # 题目网格(只绘制可见的行)
+        self.question_nav = QuestionNavigator(main_frame,
+                                              len(self.quiz.questions),
+                                              self.get_question_nav_status,
+                                              lambda i: self.quiz.questions[i]['type'],
+                                              self.jump_to_question)
+        self.question_nav.pack(fill=tk.BOTH, expand=True)
+        self.question_nav.see(self.quiz.current_question)
 
-    def create_question_grid(self):
-        """创建题目按钮网格"""
-        # 每行显示8个按钮
-        COLS = 8
-        
-        if self.current_mode == "review":
-            questions = self.quiz.questions
-        else:
-            questions = self.quiz.questions
-        
-        for i, question in enumerate(questions):
-            row = i // COLS
-            col = i % COLS
-            
-            # 创建按钮框架
-            btn_frame = ttk.Frame(self.grid_frame)
-            btn_frame.grid(row=row, column=col, padx=5, pady=5)
-            
-            # 获取题目状态
-            question_id = f"{self.current_mode}_{i}"
-            if question_id in self.answered_questions:
-                if self.question_status[question_id]:
-                    bg_color = '#28a745'  # 正确
-                    fg_color = 'white'
-                else:
-                    bg_color = '#dc3545'  # 错误
-                    fg_color = 'white'
-            else:
-                bg_color = '#f8f9fa'  # 未答
-                fg_color = 'black'
-            
-            # 创建按钮
-            btn = tk.Button(btn_frame,
-                          text=f"{i + 1}",
-                          width=6,
-                          height=2,
-                          bg=bg_color,
-                          fg=fg_color,
-                          relief='flat',
-                          command=lambda idx=i: self.jump_to_question(idx))
-            btn.pack(expand=True, fill=tk.BOTH)
-            
-            # 添加题目类型提示
-            ttk.Label(btn_frame,
-                     text=question['type'][0], # 显示类型首字
-                     font=('Microsoft YaHei', 8)).pack()
+    def get_question_nav_status(self, index):
+        """导航网格中第index题的状态: None未答, True正确, False错误"""
+        question_id = f"{self.current_mode}_{index}"
+        if question_id in self.answered_questions:
+            return bool(self.question_status[question_id])
+        return None
 
     def jump_to_question(self, index):
         """跳转到指定题目"""
@@ -1176,6 +1532,104 @@ class QuizApp:
         result_window.grab_set()
         result_window.focus_set()
 
+    def show_search_window(self):
+        """显示题目搜索窗口"""
+        if not self.quiz_dir:
+            messagebox.showinfo("提示", "请先选择题库文件夹")
+            return
+        if self.search_window is not None and self.search_window.winfo_exists():
+            self.search_window.lift()
+            return
+        
+        self.search_window = tk.Toplevel(self.root)
+        self.search_window.title("搜索题目")
+        self.search_window.geometry("700x500")
+        self.search_window.transient(self.root)
+        
+        search_frame = ttk.Frame(self.search_window, padding="20")
+        search_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 搜索框
+        entry_frame = ttk.Frame(search_frame)
+        entry_frame.pack(fill='x', pady=(0, 10))
+        ttk.Label(entry_frame, text="关键词:", style="Score.TLabel").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        search_entry = ttk.Entry(entry_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill='x', expand=True, padx=5)
+        search_entry.focus_set()
+        
+        self.search_status = ttk.Label(search_frame, text="正在建立检索索引...")
+        self.search_status.pack(anchor='w')
+        
+        # 搜索结果
+        list_frame = ttk.Frame(search_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.search_list = ttk.Treeview(list_frame, columns=('file', 'question'),
+                                        show='headings', height=12)
+        self.search_list.heading('file', text='文件名')
+        self.search_list.heading('question', text='题目')
+        self.search_list.column('file', width=150, anchor='w')
+        self.search_list.column('question', width=450, anchor='w')
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.search_list.yview)
+        self.search_list.configure(yscrollcommand=scrollbar.set)
+        self.search_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.search_practice_btn = ttk.Button(search_frame, text="练习搜索结果",
+                                              command=self.practice_search_results,
+                                              state='disabled')
+        self.search_practice_btn.pack(pady=10)
+        
+        # 增量更新索引(只处理新增或修改过的文件)
+        self.search_results = []
+        self.jobs.submit('search', lambda job, folder: self.search_index.update(folder, job),
+                         self.quiz_dir, name="正在建立检索索引",
+                         on_done=lambda _: self.run_search(),
+                         on_error=self.on_job_error)
+    
+    def schedule_search(self):
+        """输入停顿后再搜索"""
+        if self.search_timer is not None:
+            self.root.after_cancel(self.search_timer)
+        self.search_timer = self.root.after(200, self.run_search)
+    
+    def run_search(self, max_rows=500):
+        """执行搜索并显示结果(最多显示max_rows条)"""
+        self.search_timer = None
+        if self.search_window is None or not self.search_window.winfo_exists():
+            return
+        if self.jobs.is_busy('search'):
+            return  # 索引建立完成后会再次搜索
+        
+        query = self.search_var.get()
+        start = time.perf_counter()
+        self.search_results = self.search_index.search(query) if query.strip() else []
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        self.search_list.delete(*self.search_list.get_children())
+        for i, (file, question) in enumerate(self.search_results[:max_rows]):
+            self.search_list.insert('', 'end', iid=str(i),
+                                    values=(file, f"[{question.type}] {question.text.strip()}"))
+        
+        if query.strip():
+            status = f"找到 {len(self.search_results)} 题, 用时 {elapsed:.1f}ms"
+            if len(self.search_results) > max_rows:
+                status += f"(显示前{max_rows}条)"
+        else:
+            status = f"共 {len(self.search_index)} 题, 请输入关键词"
+        self.search_status.config(text=status)
+        self.search_practice_btn.state(['!disabled'] if self.search_results else ['disabled'])
+    
+    def practice_search_results(self):
+        """用搜索结果开始练习"""
+        questions = [question for _, question in self.search_results]
+        if not questions:
+            return
+        self.search_window.destroy()
+        self.search_window = None
+        self.begin_quiz("normal", questions)
+
     def show_wrong_questions_config(self):
         """显示错题重做配置窗口"""
         config_window = tk.Toplevel(self.root)
@@ -1192,11 +1646,18 @@ class QuizApp:
                  text="错题重做设置",
                  style="Header.TLabel").pack(pady=(0, 20))
         
-        # 显示各类型错题数量
+        # 显示各类型错题数量、到期数量和历史正确率
+        self.flush_writes()
+        wrong_counts = self.store.wrong_counts()
+        due_counts = self.store.due_counts()
+        answer_stats = self.store.answer_stats()
         for q_type in self.question_type_order:
-            count = len(self.wrong_questions[q_type])
+            text = f"{q_type}:{wrong_counts[q_type]}题, 到期{due_counts[q_type]}题"
+            attempts, correct = answer_stats[q_type]
+            if attempts:
+                text += f"(历史正确率 {correct / attempts:.0%})"
             ttk.Label(config_frame,
-                     text=f"{q_type}:{count}题",
+                     text=text,
                      style="Score.TLabel").pack(pady=5)
         
         # 设置移除阈值
@@ -1229,25 +1690,26 @@ class QuizApp:
         """开始错题重做"""
         if threshold is not None:
             self.remove_threshold = threshold
-        
-        # 检查是否有错题可供重做
-        total_wrong_questions = sum(len(questions) for questions in self.wrong_questions.values())
-        if total_wrong_questions == 0:
-            messagebox.showinfo("提示", "当前没有错题")
+            try:
+                self.writer.submit(('config', 'remove_threshold'), QuizStore.set_config,
+                                   'remove_threshold', threshold)
+            except Exception as e:
+                print(f"保存错题本设置时出错:{e}")
+        
+        # 获取已到期的错题(先写入尚未保存的答题记录), 按到期先后排列
+        self.flush_writes()
+        all_wrong_questions = self.store.questions_by_keys(self.store.due_keys())
+        if not all_wrong_questions:
+            next_due = self.store.next_due_at()
+            if next_due is None:
+                messagebox.showinfo("提示", "当前没有错题")
+            else:
+                due_text = time.strftime("%Y-%m-%d %H:%M", time.localtime(next_due))
+                messagebox.showinfo("提示", f"当前没有到期的错题\n下一道错题将于 {due_text} 到期")
             if config_window:
                 config_window.destroy()
             return
         
-        # 获取所有错题
-        all_wrong_questions = []
-        for q_type, questions in self.wrong_questions.items():
-            for q_hash, q_data in questions.items():
-                question = q_data['question']  # 直接使用保存的题目数据
-                all_wrong_questions.append(question)
-        
-        # 随机打乱错题顺序
-        random.shuffle(all_wrong_questions)
-        
         # 初始化错题练习
         self.current_mode = "review"
         self.quiz = Quiz()
@@ -1270,61 +1732,59 @@ class QuizApp:
         print(f"当前题目索引: {self.quiz.current_question}")
         print(f"题目列表长度: {len(self.quiz.questions)}")
 
-    def get_question_hash(self, question):
-        """生成题目的唯一标识"""
-        # 使用题目内容和选项生成哈希值
-        question_text = question['question']
-        options = sorted(question['options'])  # 排序选项以确保相同选项不同顺序的题目有相同的哈希值
-        content = question_text + ''.join(options)
-        return hashlib.md5(content.encode()).hexdigest()
-    
-    def save_wrong_questions(self):
-        """保存错题本到文件"""
-        save_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wrong_questions.json')
-        try:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                data = {
-                    'questions': self.wrong_questions,
-                    'threshold': self.remove_threshold
-                }
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存错题本时出错:{e}")
-    
-    def load_wrong_questions_from_json(self):
-        """从JSON文件加载错题"""
-        save_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wrong_questions.json')
+    def open_store(self):
+        """打开数据库(旧版本的JSON文件在窗口显示后由load_state导入)"""
+        self.store = QuizStore()
+        db_path = self.store.db_path
+        self.writer = WriteBehind(open_store=lambda: QuizStore(db_path))
+        self.remove_threshold = self.store.get_config('remove_threshold', self.remove_threshold)
+
+    def load_state(self):
+        """窗口显示后加载保存的状态: 首次运行时导入旧版本的JSON文件, 再加载上次的题库路径"""
         try:
-            if os.path.exists(save_path):
-                with open(save_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.wrong_questions = data['questions']
-                    self.remove_threshold = data['threshold']
+            if self.store.import_legacy_json():
+                self.remove_threshold = self.store.get_config('remove_threshold', self.remove_threshold)
         except Exception as e:
-            print(f"加载错题本时出错:{e}")
+            print(f"导入旧数据时出错:{e}")
+            # 同一个错误只提示一次, 之后每次启动仍会重试导入
+            if self.store.get_config('legacy_import_warning') != str(e):
+                self.writer.submit(('config', 'legacy_import_warning'), QuizStore.set_config,
+                                   'legacy_import_warning', str(e))
+                messagebox.showwarning("警告", f"导入旧版本的错题本失败, 修复该文件后下次启动时会重新导入:\n{e}")
+        self.load_last_quiz_dir()
 
     def load_last_quiz_dir(self):
         """加载上次使用的题库路径"""
         try:
-            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quiz_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    if 'quiz_dir' in config and os.path.exists(config['quiz_dir']):
-                        self.quiz_dir = config['quiz_dir']
-                        # 如果有保存的路径,自动加载题库
-                        self.show_file_select_page()
-                        self.load_quiz_files()
+            config = self.store.get_config('quiz_config')
+            if config:
+                self.ingest_workers = config.get('ingest_workers') or None
+                self.watch_interval = config.get('watch_interval') or 0
+                self.near_duplicate_threshold = config.get('near_duplicate_threshold') or 0
+                if 'quiz_dir' in config and os.path.exists(config['quiz_dir']):
+                    self.quiz_dir = config['quiz_dir']
+                    # 如果有保存的路径,自动加载题库: 先显示上次的摘要, 再在后台核对文件变化
+                    self.show_file_select_page()
+                    try:
+                        self.restore_folder_snapshot()
+                    except Exception as e:
+                        print(f"读取文件夹摘要时出错:{e}")
+                        self.scanner = None
+                    self.load_quiz_files()
         except Exception as e:
             print(f"Error loading quiz directory: {str(e)}")
 
     def save_quiz_dir(self):
         """保存当前题库路径"""
         try:
-            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quiz_config.json')
             config = {'quiz_dir': self.quiz_dir}
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            if self.ingest_workers:
+                config['ingest_workers'] = self.ingest_workers
+            if self.watch_interval:
+                config['watch_interval'] = self.watch_interval
+            if self.near_duplicate_threshold:
+                config['near_duplicate_threshold'] = self.near_duplicate_threshold
+            self.writer.submit(('config', 'quiz_config'), QuizStore.set_config, 'quiz_config', config)
         except Exception as e:
             print(f"Error saving quiz directory: {str(e)}")
 
@@ -1348,6 +1808,8 @@ class Quiz:
         """从文件加载题目"""
         all_questions = []
         
+        from docx import Document
+
         # 读取所有文件中的题目
         for file in files:
             try:
@@ -1427,7 +1889,30 @@ class Quiz:
         
         return questions
 
+# 开启性能统计时计时的函数和方法
+METRIC_FUNCTIONS = ('scan_bank_folder', 'build_question_index')
+METRIC_APP_METHODS = (
+    'load_quiz_files', 'on_scan_item', 'apply_scan_diff', 'count_available_questions',
+    'display_question', 'handle_answer', 'show_question_navigator', 'run_search',
+    'open_store', 'load_state', 'load_last_quiz_dir', 'restore_folder_snapshot', 'save_quiz_dir',
+    'load_last_exam_config', 'save_exam_config', 'start_wrong_questions_review'
+)
+METRIC_STORE_METHODS = ('record_answer', 'set_config', 'get_config', 'wrong_counts', 'due_keys',
+                        'questions_by_keys', 'answer_stats')
+
+
+def instrument_hot_paths():
+    """为主要路径加上计时(只在开启性能统计时生效)"""
+    metrics.instrument(sys.modules[__name__], METRIC_FUNCTIONS, 'jobs')
+    metrics.instrument(QuizApp, METRIC_APP_METHODS, 'app')
+    metrics.instrument(QuizReader, ('parse_questions',), 'reader')
+    metrics.instrument(QuizStore, METRIC_STORE_METHODS, 'store')
+
+
 def main():
+    if enable_from_environment(sys.argv):
+        instrument_hot_paths()
+        print(f"已开启性能统计, 退出时保存到 {metrics.report_path}")
     root = tk.Tk()
     app = QuizApp(root)
     root.mainloop()
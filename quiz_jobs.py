@@ -0,0 +1,173 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """任务已被取消"""
+
+
+class Job:
+    """后台任务句柄
+
+    任务函数在工作线程中执行, 通过progress()/emit()发送的消息
+    由JobManager在Tk主线程中转交给回调函数。
+    """
+
+    def __init__(self, key, name, callbacks, silent=False):
+        self.key = key
+        self.name = name
+        self.silent = silent  # 不在状态栏中显示
+        self.callbacks = callbacks
+        self.done = 0
+        self.total = 0
+        self.text = name
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._events = queue.Queue()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """在工作线程中调用, 任务已取消时抛出JobCancelled"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def progress(self, done, total, text=None):
+        """报告进度(工作线程中调用)"""
+        self._events.put(('progress', (done, total, text)))
+
+    def emit(self, item):
+        """发送一条中间结果(工作线程中调用)"""
+        self._events.put(('item', item))
+
+
+class JobManager:
+    """在后台线程中执行耗时操作, 并通过root.after轮询把结果交回Tk主线程
+
+    每个任务有一个key, 同一key下提交新任务会取消并取代旧任务。
+    所有回调都在主线程中执行, 且只有仍是该key当前任务时才会被调用,
+    因此被取代的任务不会覆盖较新的状态。
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=50, on_status=None):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.on_status = on_status  # on_status(job或None), 用于刷新进度条
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='quiz-job')
+        self.jobs = {}  # {key: 当前任务}
+        self._poll_id = None
+
+    def submit(self, key, func, *args, name='', silent=False, on_done=None, on_error=None,
+               on_item=None, on_progress=None, on_cancel=None):
+        """提交任务
+
+        func(job, *args)在工作线程中执行, 返回值交给on_done(result)。
+        silent为True的任务不会触发状态栏显示。
+        """
+        previous = self.jobs.get(key)
+        if previous is not None:
+            previous.cancel()
+
+        job = Job(key, name, {
+            'done': on_done,
+            'error': on_error,
+            'item': on_item,
+            'progress': on_progress,
+            'cancel': on_cancel
+        }, silent=silent)
+        self.jobs[key] = job
+        job.future = self.executor.submit(func, job, *args)
+        self._notify_status()
+        self._schedule_poll()
+        return job
+
+    def is_current(self, job):
+        """任务是否仍是其key下的最新任务"""
+        return self.jobs.get(job.key) is job
+
+    def is_busy(self, key=None):
+        if key is None:
+            return bool(self.jobs)
+        return key in self.jobs
+
+    def cancel(self, key=None):
+        """取消指定key(或全部)的任务"""
+        keys = list(self.jobs) if key is None else [key]
+        for k in keys:
+            job = self.jobs.pop(k, None)
+            if job is None:
+                continue
+            job.cancel()
+            callback = job.callbacks['cancel']
+            if callback:
+                callback()
+        self._notify_status()
+
+    def shutdown(self):
+        """取消所有任务并停止轮询"""
+        for job in self.jobs.values():
+            job.cancel()
+        self.jobs = {}
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _notify_status(self):
+        if self.on_status:
+            current = [job for job in self.jobs.values() if not job.silent]
+            self.on_status(current[-1] if current else None)
+
+    def _poll(self):
+        self._poll_id = None
+        for job in list(self.jobs.values()):
+            self._deliver(job)
+        if self.jobs:
+            self._schedule_poll()
+
+    def _deliver(self, job):
+        # 先转交中间消息
+        while self.is_current(job):
+            try:
+                kind, value = job._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                job.done, job.total, text = value
+                if text:
+                    job.text = text
+                if job.callbacks['progress']:
+                    job.callbacks['progress'](*value)
+                self._notify_status()
+            elif job.callbacks['item']:
+                job.callbacks['item'](value)
+
+        if not self.is_current(job) or not job.future.done() or not job._events.empty():
+            return
+
+        # 任务结束
+        del self.jobs[job.key]
+        self._notify_status()
+        try:
+            result = job.future.result()
+        except JobCancelled:
+            return
+        except Exception as e:
+            if job.callbacks['error']:
+                job.callbacks['error'](e)
+            else:
+                print(f"后台任务 {job.name} 出错:{e}")
+            return
+        if job.callbacks['done']:
+            job.callbacks['done'](result)
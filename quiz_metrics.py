@@ -0,0 +1,198 @@
+"""可选的性能统计
+
+默认关闭, 此时不包装任何函数, 没有额外开销。设置环境变量 QUIZ_METRICS=1
+(或 QUIZ_METRICS=报告文件路径)或以 --metrics 参数启动时开启: 指定的函数和方法
+被替换为计时的包装, 每次调用的耗时记入该操作的直方图, 程序退出时把统计
+保存为JSON(默认为程序目录下的quiz_metrics.json)。
+
+计数器记录解析缓存的命中/未命中(parse_cache.*)、扫描时重新解析和未变化的
+文件数(scan.*)以及被后续提交覆盖的写入(writer.coalesced.*)。
+在进程池子进程中执行的解析不会被统计。
+"""
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+# 开启统计的环境变量和命令行参数
+ENV_VAR = 'QUIZ_METRICS'
+FLAG = '--metrics'
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quiz_metrics.json')
+
+# 直方图每个2倍区间分成的桶数(相对误差约1/8)
+SUB_BUCKETS = 4
+
+
+class Histogram:
+    """耗时直方图(单位: 微秒)
+
+    按对数分桶, 每个2倍区间分SUB_BUCKETS个桶, 占用的内存与调用次数无关。
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = {}  # {(指数, 子桶): 次数}
+
+    def add(self, micros):
+        self.count += 1
+        self.total += micros
+        if micros < self.min:
+            self.min = micros
+        if micros > self.max:
+            self.max = micros
+        mantissa, exponent = math.frexp(micros)  # micros = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        bucket = (exponent, int((mantissa - 0.5) * 2 * SUB_BUCKETS))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @staticmethod
+    def upper_bound(bucket):
+        exponent, sub = bucket
+        return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+
+    def percentile(self, q):
+        """第q百分位的耗时(取所在桶的上界, 不超过最大值)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total / 1000, 3),
+            'mean_us': round(self.total / self.count, 1) if self.count else 0.0,
+            'min_us': round(self.min, 1) if self.count else 0.0,
+            'p50_us': round(self.percentile(50), 1),
+            'p90_us': round(self.percentile(90), 1),
+            'p99_us': round(self.percentile(99), 1),
+            'max_us': round(self.max, 1),
+            # [上界(微秒), 次数], 便于之后合并或重新计算百分位
+            'buckets': [[round(self.upper_bound(bucket), 3), count]
+                        for bucket, count in sorted(self.buckets.items())]
+        }
+
+
+class Metrics:
+    """各操作的耗时直方图和计数器(可在多个线程中记录)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.report_path = DEFAULT_REPORT_PATH
+        self.started = time.time()
+        self.histograms = {}  # {操作名: Histogram}
+        self.counters = {}  # {名称: 次数}
+        self.gauges = {}  # {名称: 最近一次的取值}
+        self.lock = threading.Lock()
+
+    def enable(self, report_path=None):
+        """开启统计, 程序退出时保存报告"""
+        if report_path:
+            self.report_path = report_path
+        if not self.enabled:
+            self.enabled = True
+            atexit.register(self.dump)
+
+    def observe(self, name, seconds):
+        """记录一次操作的耗时(秒)"""
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds * 1e6)
+
+    def count(self, name, n=1):
+        """计数器加n(未开启统计时不记录)"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        """记录某个量的当前值(如队列长度)"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def wrap(self, func, name):
+        """返回计时的包装函数"""
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, perf_counter() - start)
+        timed.__wrapped_metric__ = name
+        return timed
+
+    def instrument(self, owner, names, prefix):
+        """把owner(类或模块)上的函数替换为计时的包装, 操作名为 "prefix.函数名"
+
+        未开启统计时不做任何事。
+        """
+        if not self.enabled:
+            return
+        for name in names:
+            func = getattr(owner, name)
+            if getattr(func, '__wrapped_metric__', None):
+                continue
+            setattr(owner, name, self.wrap(func, f"{prefix}.{name}"))
+
+    def report(self):
+        with self.lock:
+            return {
+                'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+                'elapsed_s': round(time.time() - self.started, 1),
+                'operations': {name: histogram.to_dict()
+                               for name, histogram in sorted(self.histograms.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'gauges': dict(sorted(self.gauges.items()))
+            }
+
+    def dump(self, path=None):
+        """保存报告, 返回文件路径(失败时为None)"""
+        path = path or self.report_path
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"保存性能统计时出错:{e}")
+            return None
+        return path
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.started = time.time()
+
+
+# 全局统计
+metrics = Metrics()
+
+
+def enable_from_environment(argv):
+    """按环境变量或命令行参数决定是否开启统计(会从argv中移除--metrics), 返回是否开启"""
+    value = os.environ.get(ENV_VAR, '').strip()
+    if FLAG in argv:
+        argv.remove(FLAG)
+        value = value or '1'
+    if value and value != '0':
+        metrics.enable(None if value == '1' else value)
+    return metrics.enabled
@@ -0,0 +1,235 @@
+import hashlib
+import re
+import sys
+import unicodedata
+
+# 题型(固定取值, 统一使用驻留字符串)
+QUESTION_TYPES = tuple(sys.intern(t) for t in ('单选题', '多选题', '判断题'))
+
+# 选项标记后的分隔符
+OPTION_SEPARATORS = '.、'
+
+# 标准选项格式 "A. 内容" 中标记与内容之间的部分
+DEFAULT_SEPARATOR = '. '
+
+
+# NFKC未覆盖的中文标点
+PUNCTUATION_MAP = str.maketrans({
+    '。': '.', '、': ',', '“': '"', '”': '"', '‘': "'", '’': "'",
+    '【': '[', '】': ']', '《': '<', '》': '>', '～': '~'
+})
+
+WHITESPACE = re.compile(r'\s+')
+
+# 规范化后的题号和题型标记, 如 "12." "三," "(多选题)" "(单选题,1.0分)"
+NUMBERING = re.compile(r'^(?:\d+|[一二三四五六七八九十]+)[.,、]|[(\[](?:单选题|多选题|判断题)[^)\]]*[)\]]')
+
+
+def normalize_text(text):
+    """统一全角/半角字符和中英文标点, 去掉所有空白, 字母转小写"""
+    text = unicodedata.normalize('NFKC', text).translate(PUNCTUATION_MAP)
+    return WHITESPACE.sub('', text).lower()
+
+
+def question_digest(text, option_texts):
+    """题目的稳定标识: 规范化后的题干和(排序后的)选项内容的16字节哈希
+
+    不含题号、题型标记和选项标记, 因此同一题目在不同题库中的题号不同、
+    选项顺序不同、空白或全半角标点不同时标识相同。
+    """
+    text = NUMBERING.sub('', normalize_text(text))
+    content = '\x1f'.join([text] + sorted(normalize_text(t) for t in option_texts))
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+def question_key(text, option_texts):
+    """题目标识的十六进制形式(数据库中保存的形式)"""
+    return question_digest(text, option_texts).hex()
+
+
+def split_option(option):
+    """把 "A. 选项内容" 拆成 ('A', '. ', '选项内容'), 三部分拼接即为原文"""
+    option = option.strip()
+    if len(option) >= 2 and 'A' <= option[0] <= 'Z' and (option[1] in OPTION_SEPARATORS or option[1].isspace()):
+        text = option[2:].strip()
+    else:
+        text = option[1:].strip()
+    return option[:1], option[1:len(option) - len(text)], text
+
+
+def normalize_answer_letters(answer, q_type):
+    """把答案统一为不带分隔符的大写字母, 如 "A, C" -> "AC"; 判断题为 "T"/"F" """
+    answer = answer.strip().upper()
+    if q_type == '判断题':
+        if answer in ('对', 'T'):
+            return 'T'
+        if answer in ('错', 'F'):
+            return 'F'
+    letters = ''.join(c for c in answer if 'A' <= c <= 'Z')
+    return letters or answer
+
+
+# 答案位掩码: 每个字母占一位(A为第0位), 判断题的对/错即T/F两位
+LETTER_BITS = {chr(65 + i): 1 << i for i in range(26)}
+
+# 判断题的中文答案
+TRUE_FALSE_LETTERS = {'对': 'T', '错': 'F'}
+
+
+def answer_mask(answer):
+    """把答案编码为位掩码, 如 "A, C" -> 0b101, "对" -> T的位; 没有字母时为0
+
+    与字母顺序和分隔符无关, 多选题只需比较两个整数。
+    """
+    answer = answer.strip().upper()
+    answer = TRUE_FALSE_LETTERS.get(answer, answer)
+    mask = 0
+    for c in answer:
+        mask |= LETTER_BITS.get(c, 0)
+    return mask
+
+
+def mask_letters(mask):
+    """位掩码还原为按字母顺序排列的答案, 如 0b101 -> "AC" """
+    return ''.join(letter for letter, bit in LETTER_BITS.items() if mask & bit)
+
+
+def partial_credit(selected, correct):
+    """部分得分: 选了任何错误选项为0, 否则为选对的正确选项所占比例"""
+    if not correct or selected & ~correct:
+        return 0.0
+    return selected.bit_count() / correct.bit_count()
+
+
+def option_state(bit, selected, correct):
+    """选项的标记: 'correct' 正确选项, 'wrong' 选了但不正确, None 其他"""
+    if bit & correct:
+        return 'correct'
+    if bit & selected:
+        return 'wrong'
+    return None
+
+
+class Question:
+    """一道题目
+
+    使用__slots__代替字典以减少内存占用。选项在解析时已拆分为标记和内容,
+    答案统一为大写字母, 需要时再编码为位掩码(answer_mask)。规范化内容的哈希以16字节
+    保存在digest中, key为其十六进制形式。为了便于逐步迁移,
+    仍支持 question['type'] 这样的字典式访问。
+    """
+
+    __slots__ = ('text', 'labels', 'option_texts', 'separators', 'answer', 'type', 'digest')
+
+    # 字典式访问的键
+    KEYS = ('question', 'options', 'answer', 'type')
+
+    def __init__(self, text, labels, option_texts, answer, q_type, separators=DEFAULT_SEPARATOR, digest=None):
+        self.text = text
+        self.labels = sys.intern(labels)  # 选项标记, 如 "ABCD"
+        self.option_texts = tuple(option_texts)  # 去掉标记后的选项内容
+        # 标记与内容之间的原文, 用于还原选项原文; 所有选项相同时只存一个字符串
+        if isinstance(separators, str):
+            self.separators = sys.intern(separators)
+        else:
+            self.separators = tuple(sys.intern(sep) for sep in separators)
+        self.answer = sys.intern(answer)
+        self.type = sys.intern(q_type)
+        # 稳定标识在创建时计算一次, 用于错题本和答题记录
+        self.digest = digest or question_digest(text, self.option_texts)
+
+    @classmethod
+    def parse(cls, text, options, answer, q_type):
+        """由解析出的题干、选项原文和答案创建题目"""
+        labels = []
+        separators = []
+        option_texts = []
+        for option in options:
+            label, separator, option_text = split_option(option)
+            labels.append(label)
+            separators.append(separator)
+            option_texts.append(option_text)
+        if len(set(separators)) <= 1:
+            separators = separators[0] if separators else DEFAULT_SEPARATOR
+        return cls(text, ''.join(labels), option_texts,
+                   normalize_answer_letters(answer, q_type), q_type, separators)
+
+    @classmethod
+    def from_dict(cls, data):
+        """由旧的题目字典创建题目"""
+        if isinstance(data, cls):
+            return data
+        return cls.parse(data['question'], data['options'], data['answer'], data['type'])
+
+    @property
+    def options(self):
+        """选项原文"""
+        separators = self.separators
+        if isinstance(separators, str):
+            return tuple(label + separators + text for label, text in zip(self.labels, self.option_texts))
+        return tuple(label + separator + text
+                     for label, separator, text in zip(self.labels, separators, self.option_texts))
+
+    @property
+    def answer_mask(self):
+        """答案的位掩码(由答案字母计算, 不占用实例空间)"""
+        return answer_mask(self.answer)
+
+    @property
+    def key(self):
+        """稳定标识(十六进制字符串)"""
+        return self.digest.hex()
+
+    @property
+    def choices(self):
+        """(标记, 内容) 列表"""
+        return list(zip(self.labels, self.option_texts))
+
+    def to_dict(self):
+        """转换为字典(用于保存为JSON)"""
+        return {
+            'question': self.text,
+            'options': list(self.options),
+            'answer': self.answer,
+            'type': self.type
+        }
+
+    # 字典式访问
+    def __getitem__(self, key):
+        if key == 'question':
+            return self.text
+        if key == 'options':
+            return self.options
+        if key == 'answer':
+            return self.answer
+        if key == 'type':
+            return self.type
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __eq__(self, other):
+        if isinstance(other, Question):
+            return (self.text, self.labels, self.option_texts, self.answer, self.type) == \
+                   (other.text, other.labels, other.option_texts, other.answer, other.type)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # 以位置参数序列化, 比默认的slots状态字典更紧凑
+        return (self.__class__, (self.text, self.labels, self.option_texts,
+                                 self.answer, self.type, self.separators, self.digest))
+
+    def __repr__(self):
+        return f"Question({self.type}, {self.text!r}, answer={self.answer!r})"
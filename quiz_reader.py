@@ -1,90 +1,127 @@
-from docx import Document
 import re
 import os
+from quiz_cache import get_parse_cache, count_question_types
+from docx_stream import iter_paragraph_texts
+from quiz_question import Question, answer_mask, partial_credit
+
+# 段落分类: 一次匹配即可区分答案行、题目行和选项行(按此顺序优先)
+LINE_ANSWER = 'answer'
+LINE_QUESTION = 'question'
+LINE_OPTION = 'option'
+LINE_PATTERN = re.compile(
+    r'(?P<answer>(?:正确答案|答案|Answer)[:：])'
+    r'|(?P<question>[0-9一二三四五六七八九十]+[.、])'
+    r'|(?P<option>[A-Z](?:[.、]|\s))'
+)
+
+def normalize_answer(answer):
+    """统一答案格式: 大写, 对/错转为T/F, 中文逗号转为英文逗号"""
+    answer = answer.strip().upper()
+    if answer == "对":
+        return "T"
+    if answer == "错":
+        return "F"
+    return answer.replace('，', ',')
+
+# 解析后端: 'stream' 直接流式读取正文XML, 'docx' 使用python-docx构建完整文档对象
+PARSER_BACKENDS = ('stream', 'docx')
+DEFAULT_BACKEND = 'stream'
 
 class QuizReader:
-    def __init__(self, docx_path):
-        self.document = Document(docx_path)
+    def __init__(self, docx_path, use_cache=True, backend=DEFAULT_BACKEND):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"未知的解析后端:{backend}")
+        self.docx_path = docx_path
+        self.backend = backend
+        self.document = None
         self.questions = []
         self.current_question = 0
         self.score = 0
         self.total_score = 0
         self.wrong_questions = []  # 存储错题
         self.is_review_mode = False  # 是否是错题重做模式
+        self.type_counts = {'单选题': 0, '多选题': 0, '判断题': 0}
+
+        if docx_path is None:
+            # 空题库(由调用方直接填充题目)
+            return
+
+        cache = get_parse_cache() if use_cache else None
+        if cache is not None:
+            payload, token = cache.lookup(docx_path)
+            if payload is not None:
+                # 文件未变化, 直接使用缓存的解析结果
+                self.questions = payload['questions']
+                self.type_counts = payload['type_counts']
+                self.total_score = len(self.questions)
+                return
+
+        if backend == 'docx':
+            # python-docx导入较慢, 只在使用该后端时导入
+            from docx import Document
+            self.document = Document(docx_path)
         self.parse_questions()
+        self.type_counts = count_question_types(self.questions)
+        if cache is not None:
+            cache.put(docx_path, token, self.questions)
 
-    def parse_questions(self):
+    def iter_paragraph_texts(self):
+        """按所选后端逐段返回文档文本"""
+        if self.document is not None:
+            return (paragraph.text for paragraph in self.document.paragraphs)
+        return iter_paragraph_texts(self.docx_path)
+
+    def parse_questions(self, paragraphs=None):
+        """解析题目, paragraphs为逐段文本, 默认从文档读取"""
+        if paragraphs is None:
+            paragraphs = self.iter_paragraph_texts()
+        
         current_question = None
         current_options = []
         current_answer = None
         
-        for paragraph in self.document.paragraphs:
-            text = paragraph.text.strip()
+        for text in paragraphs:
+            text = text.strip()
             if not text:
                 continue
-
-            # 检查是否是答案
-            if text.startswith(('答案：', 'Answer:', '答案:', 'Answer：', '正确答案:', '正确答案：')):
-                if text.startswith(('正确答案:', '正确答案：')):
-                    current_answer = text.split(':')[-1].strip()
-                    if current_answer == "对":
-                        current_answer = "T"
-                    elif current_answer == "错":
-                        current_answer = "F"
-                else:
-                    current_answer = text.split('：')[-1].split(':')[-1].strip().upper()
-                
-                # 处理多选题答案，将中文逗号转换为英文逗号
-                current_answer = current_answer.replace('，', ',')
-                
+            
+            # 一次匹配判断是答案、新题目还是选项
+            match = LINE_PATTERN.match(text)
+            if match is None:
+                continue
+            kind = match.lastgroup
+            
+            if kind == LINE_ANSWER:
+                current_answer = normalize_answer(text[match.end():])
                 # 如果已有题目和答案，保存题目
                 if current_question and current_answer:
-                    question_type = self.determine_question_type(current_options, current_answer)
-                    self.questions.append({
-                        'question': current_question,
-                        'options': current_options.copy(),
-                        'answer': current_answer,
-                        'type': question_type
-                    })
-                    self.total_score += 1
+                    self.add_question(current_question, current_options, current_answer)
                     current_question = None
                     current_options = []
                     current_answer = None
-                continue
-
-            # 检查是否是新题目
-            if re.match(r'^[0-9一二三四五六七八九十]+[.、]', text):
+            
+            elif kind == LINE_QUESTION:
                 # 如果已有题目和答案，保存之前的题目
                 if current_question and current_answer:
-                    question_type = self.determine_question_type(current_options, current_answer)
-                    self.questions.append({
-                        'question': current_question,
-                        'options': current_options.copy(),
-                        'answer': current_answer,
-                        'type': question_type
-                    })
-                    self.total_score += 1
-                
+                    self.add_question(current_question, current_options, current_answer)
                 current_question = text
                 current_options = []
                 current_answer = None
             
-            # 如果是选项（以A-Z开头）
-            elif re.match(r'^[A-Z][.、]', text) or re.match(r'^[A-Z]\s', text):
+            else:  # 选项（以A-Z开头）
                 current_options.append(text)
-
+        
         # 添加最后一个题目
         if current_question and current_answer:
-            question_type = self.determine_question_type(current_options, current_answer)
-            self.questions.append({
-                'question': current_question,
-                'options': current_options,
-                'answer': current_answer,
-                'type': question_type
-            })
-            self.total_score += 1
+            self.add_question(current_question, current_options, current_answer)
+
+    def add_question(self, question_text, options, answer):
+        """保存一道解析完成的题目"""
+        q_type = self.determine_question_type(options, answer, question_text)
+        self.questions.append(Question.parse(question_text, options, answer, q_type))
+        self.total_score += 1
 
-    def determine_question_type(self, options, answer):
+    def determine_question_type(self, options, answer, question_text=""):
         """根据题目格式判断题目类型"""
         # 首先检查是否是判断题
         if not options:
@@ -92,9 +129,8 @@ class QuizReader:
         elif len(options) == 2 and all(opt.endswith(('对', '错')) for opt in options):
             return "判断题"
             
-        # 检查题目文本中是否包含题型标识
-        question_text = self.questions[-1]['question'] if self.questions else ""
-        if '多选题' in question_text or '(多选题' in question_text or '（多选题' in question_text:
+        # 检查当前题目文本中是否包含题型标识
+        if '多选题' in question_text:
             return "多选题"
         
         # 根据答案格式判断
@@ -146,29 +182,22 @@ class QuizReader:
                 return False
             question = self.questions[self.current_question]
 
-        user_answer = user_answer.upper().strip()
-        correct_answer = question['answer'].upper()
-
-        # 根据题型进行不同的答案处理
-        if question['type'] == "判断题":
-            if user_answer == "对" or user_answer == "T":
-                user_answer = "T"
-            elif user_answer == "错" or user_answer == "F":
-                user_answer = "F"
-        elif question['type'] == "多选题":
-            # 将答案转换为排序后的列表进行比较
-            user_answers = sorted(user_answer.replace(" ", "").split(","))
-            correct_answers = sorted(correct_answer.replace(" ", "").split(","))
-            is_correct = user_answers == correct_answers
-        else:  # 单选题
-            is_correct = user_answer == correct_answer
+        # 用户答案编码为位掩码(与字母顺序和分隔符无关)后与正确答案比较
+        question = Question.from_dict(question)
+        selected = answer_mask(user_answer)
+        correct_answer = question.answer
+        is_correct = selected != 0 and selected == question.answer_mask
 
         if is_correct:
             print("✓ 回答正确！")
             if not self.is_review_mode:
                 self.score += 1
         else:
-            print(f"✗ 回答错误。正确答案是：{correct_answer}")
+            credit = partial_credit(selected, question.answer_mask)
+            if credit:
+                print(f"✗ 回答不完整(选对了{credit:.0%}的正确选项)。正确答案是：{correct_answer}")
+            else:
+                print(f"✗ 回答错误。正确答案是：{correct_answer}")
             if not self.is_review_mode:
                 self.wrong_questions.append(question)
 
@@ -211,6 +240,10 @@ def list_docx_files(folder_path):
         return []
     return docx_files
 
+def load_bank_counts(docx_path):
+    """解析单个题库并返回各类型题目数量(供进程池调用)"""
+    return QuizReader(docx_path).type_counts
+
 def main():
     while True:
         folder_path = input("请输入题库文件夹路径：").strip()
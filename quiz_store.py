@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from quiz_question import Question, QUESTION_TYPES
+from review_scheduler import DEFAULT_EASE, next_schedule
+from wrong_book import WrongQuestionBook
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 默认数据库文件(与配置文件同级)
+DEFAULT_DB_PATH = os.path.join(APP_DIR, 'quiz_data.db')
+
+# 仓库附带的示例错题本(JSON不完整, 只有一道"test"题)去掉空白后的SHA-1,
+# 这个文件视为没有需要导入的错题
+SAMPLE_WRONG_BOOK_SHA1 = '05c5dc6b6a07c8b5c1ec87b9be55a4a135b229d4'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    hash TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    answer TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(type);
+
+CREATE TABLE IF NOT EXISTS wrong_questions (
+    hash TEXT PRIMARY KEY REFERENCES questions(hash),
+    type TEXT NOT NULL,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    added_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    reps INTEGER NOT NULL DEFAULT 0,
+    interval REAL NOT NULL DEFAULT 0,
+    ease REAL NOT NULL DEFAULT {ease},
+    due_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_wrong_questions_type ON wrong_questions(type);
+-- 包含hash列, 查询到期题目时不必回表
+CREATE INDEX IF NOT EXISTS idx_wrong_questions_due ON wrong_questions(due_at, hash);
+
+CREATE TABLE IF NOT EXISTS answer_history (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    type TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    is_correct INTEGER NOT NULL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answer_history_hash ON answer_history(hash, answered_at);
+CREATE INDEX IF NOT EXISTS idx_answer_history_type ON answer_history(type);
+
+CREATE TABLE IF NOT EXISTS config (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+""".format(ease=DEFAULT_EASE)
+
+
+def is_sample_wrong_book(path):
+    """是否为仓库附带的示例错题本(忽略空白和换行符的差异)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return False
+    return hashlib.sha1(b''.join(data.split())).hexdigest() == SAMPLE_WRONG_BOOK_SHA1
+
+
+def load_commented_json(path):
+    """读取JSON配置文件, 忽略以#开头的注释行(附带的配置文件第一行是说明)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if not line.lstrip().startswith('#')]
+    return json.loads(''.join(lines))
+
+
+class QuizStore:
+    """错题本、答题记录和配置的SQLite存储
+
+    使用WAL模式, 写入时其他连接仍可读取。错题数量统计和错题列表
+    直接由查询得到, 不再在内存中维护整个错题本。
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # 配置
+    def get_config(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM config WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_config(self, key, value):
+        with self.conn:
+            self._set_config(key, value)
+
+    def _set_config(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)',
+                          (key, json.dumps(value, ensure_ascii=False)))
+
+    # 题目
+    def _save_question(self, question):
+        self.conn.execute(
+            'INSERT OR IGNORE INTO questions (hash, type, text, options, answer) VALUES (?, ?, ?, ?, ?)',
+            (question.key, question['type'], question['question'],
+             json.dumps(list(question['options']), ensure_ascii=False), question['answer']))
+
+    @staticmethod
+    def _row_question(row):
+        """由 (题干, 选项JSON, 答案, 题型) 创建题目"""
+        text, options, answer, q_type = row
+        return Question.parse(text, json.loads(options), answer, q_type)
+
+    # 答题记录
+    def record_answer(self, question, answer, is_correct, mode, remove_threshold=None):
+        """记录一次作答(题目内容同时保存, 便于之后按题目查询记录)
+
+        remove_threshold不为None时同时更新错题本: 答错加入错题本或重置正确次数,
+        答对增加正确次数, 达到阈值后移除。错题的下次复习时间按SM-2计算
+        (见review_scheduler.next_schedule)。
+        """
+        now = time.time()
+        q_hash = question.key
+        q_type = question['type']
+        with self.conn:
+            self._save_question(question)
+            self.conn.execute(
+                'INSERT INTO answer_history (hash, type, mode, answer, is_correct, answered_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (q_hash, q_type, mode, answer, int(is_correct), now))
+            if remove_threshold is None:
+                return
+            row = self.conn.execute(
+                'SELECT correct_count, reps, interval, ease FROM wrong_questions WHERE hash = ?',
+                (q_hash,)).fetchone()
+            if row is None:
+                if not is_correct:
+                    self.conn.execute(
+                        'INSERT INTO wrong_questions (hash, type, correct_count, added_at, updated_at, due_at) '
+                        'VALUES (?, ?, 0, ?, ?, ?)', (q_hash, q_type, now, now, now))
+                return
+            correct_count, *schedule = row
+            correct_count = correct_count + 1 if is_correct else 0
+            if correct_count >= remove_threshold:
+                self.conn.execute('DELETE FROM wrong_questions WHERE hash = ?', (q_hash,))
+                return
+            reps, interval, ease, due_at = next_schedule(*schedule, is_correct, now)
+            self.conn.execute(
+                'UPDATE wrong_questions SET correct_count = ?, updated_at = ?, '
+                'reps = ?, interval = ?, ease = ?, due_at = ? WHERE hash = ?',
+                (correct_count, now, reps, interval, ease, due_at, q_hash))
+
+    # 查询
+    def wrong_counts(self):
+        """各类型错题数量"""
+        counts = {q_type: 0 for q_type in QUESTION_TYPES}
+        for q_type, count in self.conn.execute(
+                'SELECT type, COUNT(*) FROM wrong_questions GROUP BY type'):
+            counts[q_type] = count
+        return counts
+
+    def wrong_questions(self, q_type=None):
+        """错题列表(可按类型筛选)"""
+        sql = ('SELECT q.text, q.options, q.answer, q.type FROM wrong_questions w '
+               'JOIN questions q ON q.hash = w.hash')
+        if q_type is None:
+            rows = self.conn.execute(sql)
+        else:
+            rows = self.conn.execute(sql + ' WHERE w.type = ?', (q_type,))
+        return [self._row_question(row) for row in rows]
+
+    def due_counts(self, now=None):
+        """各类型已到期的错题数量"""
+        counts = {q_type: 0 for q_type in QUESTION_TYPES}
+        for q_type, count in self.conn.execute(
+                'SELECT type, COUNT(*) FROM wrong_questions WHERE due_at <= ? GROUP BY type',
+                (time.time() if now is None else now,)):
+            counts[q_type] = count
+        return counts
+
+    def due_keys(self, now=None, limit=None):
+        """按到期先后排列的已到期错题标识(最多limit道), 只读取到期时间索引"""
+        sql = 'SELECT hash FROM wrong_questions WHERE due_at <= ? ORDER BY due_at, hash'
+        params = (time.time() if now is None else now,)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def next_due_at(self):
+        """最早的到期时间, 错题本为空时返回None"""
+        return self.conn.execute('SELECT MIN(due_at) FROM wrong_questions').fetchone()[0]
+
+    def questions_by_keys(self, keys):
+        """按题目标识读取题目, 顺序与keys相同(不存在的标识跳过)"""
+        found = {}
+        keys = list(keys)
+        # 分批查询, 避免超过SQLite的参数个数限制
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ', '.join('?' * len(batch))
+            for q_hash, *row in self.conn.execute(
+                    f'SELECT hash, text, options, answer, type FROM questions WHERE hash IN ({placeholders})',
+                    batch):
+                found[q_hash] = self._row_question(row)
+        return [found[key] for key in keys if key in found]
+
+    def answer_stats(self, mode=None):
+        """各类型的 (作答次数, 答对次数)"""
+        sql = 'SELECT type, COUNT(*), COALESCE(SUM(is_correct), 0) FROM answer_history'
+        if mode is None:
+            rows = self.conn.execute(sql + ' GROUP BY type')
+        else:
+            rows = self.conn.execute(sql + ' WHERE mode = ? GROUP BY type', (mode,))
+        stats = {q_type: (0, 0) for q_type in QUESTION_TYPES}
+        for q_type, attempts, correct in rows:
+            stats[q_type] = (attempts, correct)
+        return stats
+
+    # 导入旧数据
+    def import_legacy_json(self, app_dir=APP_DIR):
+        """一次性导入旧版本的JSON文件(错题本wrong_questions.json、考试配置、题库路径配置)
+
+        导入后原文件保留不动, 作为备份。错题本无法读取时其余文件照常导入, 但不标记为
+        已导入(下次调用时重试错题本), 并抛出RuntimeError, 以免用户的错题记录被悄悄丢弃。
+        """
+        if self.get_config('legacy_json_imported'):
+            return False
+        now = time.time()
+        book_path = os.path.join(app_dir, 'wrong_questions.json')
+        book = WrongQuestionBook(book_path)
+        book_error = None
+        if not is_sample_wrong_book(book_path):
+            try:
+                book.load()
+            except Exception as e:
+                book_error = e
+        with self.conn:
+            # 错题本中的旧标识换成Question.key
+            for q_type, questions in book.questions.items():
+                for q_data in questions.values():
+                    question = q_data['question']
+                    self._save_question(question)
+                    self.conn.execute(
+                        'INSERT INTO wrong_questions (hash, type, correct_count, added_at, updated_at, due_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?) '
+                        'ON CONFLICT(hash) DO UPDATE SET correct_count = MIN(correct_count, excluded.correct_count)',
+                        (question.key, q_type, q_data['correct_count'], now, now, now))
+            if book_error is None and self.get_config('remove_threshold') is None:
+                self._set_config('remove_threshold', book.threshold)
+            for key, file_name in (('exam_config', 'exam_config.json'),
+                                   ('quiz_config', 'quiz_config.json')):
+                path = os.path.join(app_dir, file_name)
+                if not os.path.exists(path) or self.get_config(key) is not None:
+                    continue
+                try:
+                    self._set_config(key, load_commented_json(path))
+                except Exception as e:
+                    print(f"导入{file_name}时出错:{e}")
+            if book_error is None:
+                self._set_config('legacy_json_imported', True)
+        if book_error is not None:
+            raise RuntimeError(f"读取旧错题本 {book.path} 出错:{book_error}") from book_error
+        return True
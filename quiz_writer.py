@@ -0,0 +1,156 @@
+import threading
+import time
+
+from quiz_metrics import metrics
+
+
+class WriteBehind:
+    """后台写入线程
+
+    保存操作先放入队列, 由后台线程在最后一次提交delay秒后(最迟max_delay秒)
+    统一写入, 界面线程不再等待磁盘。同一key的多次提交只保留最后一次
+    (key为None的提交不合并, 如答题记录)。
+
+    open_store不为None时在写入线程中打开自己的数据库连接, 任务以
+    func(store, *args)的形式调用, 例如 submit(key, QuizStore.set_config, 'k', v)。
+    """
+
+    def __init__(self, open_store=None, delay=0.3, max_delay=2.0):
+        self.open_store = open_store
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending = {}  # {key: (func, args)}, 按提交顺序写入
+        self._inflight = {}  # 正在写入的一批任务
+        self._seq = 0  # 不合并的任务使用的序号
+        self._first_queued = None
+        self._last_queued = None
+        self._writing = False
+        self._flush_requested = False
+        self._closing = False
+        self._cond = threading.Condition()
+        # 统计信息
+        self.queued = 0  # 提交次数
+        self.coalesced = 0  # 被后续提交覆盖的次数
+        self.written = 0  # 实际写入次数
+        self.failed = 0
+        self.batches = 0
+        self.total_latency = 0.0  # 写入耗时合计(秒, 含失败的写入)
+        self.max_latency = 0.0
+        self._thread = threading.Thread(target=self._run, name='quiz-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, key, func, *args):
+        """提交一个写入任务"""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError('写入线程已关闭')
+            if key is None:
+                self._seq += 1
+                key = ('seq', self._seq)
+            elif key in self._pending:
+                # 最新的状态覆盖旧的, 并排到队尾
+                del self._pending[key]
+                self.coalesced += 1
+                metrics.count('writer.coalesced.' + '.'.join(map(str, key)))
+            self._pending[key] = (func, args)
+            self.queued += 1
+            now = time.monotonic()
+            if self._first_queued is None:
+                self._first_queued = now
+            self._last_queued = now
+            self._cond.notify()
+
+    def pending_args(self, key):
+        """该key尚未写完的最新任务的参数(没有时为None)
+
+        读取刚提交的状态(如配置)时先查这里, 不必等待写入完成。
+        """
+        with self._cond:
+            task = self._pending.get(key) or self._inflight.get(key)
+            return task[1] if task else None
+
+    def flush(self, timeout=None):
+        """立即写入所有已提交的任务并等待完成, 超时返回False(剩余任务仍会尽快写入)"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify()
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self, timeout=None):
+        """写入剩余任务并结束线程"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def metrics(self):
+        """写入统计"""
+        with self._cond:
+            return {
+                'pending': len(self._pending),
+                'queued': self.queued,
+                'coalesced': self.coalesced,
+                'written': self.written,
+                'failed': self.failed,
+                'batches': self.batches,
+                'avg_latency_ms': self.total_latency / (self.written + self.failed) * 1000
+                                  if self.written + self.failed else 0.0,
+                'max_latency_ms': self.max_latency * 1000
+            }
+
+    def _due(self):
+        """距离下次写入还需等待的秒数"""
+        if self._flush_requested or self._closing:
+            return 0
+        now = time.monotonic()
+        return max(0, min(self._last_queued + self.delay, self._first_queued + self.max_delay) - now)
+
+    def _run(self):
+        store = None
+        if self.open_store is not None:
+            try:
+                store = self.open_store()
+            except Exception as e:
+                print(f"写入线程打开数据库时出错:{e}")
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._flush_requested = False
+                        self._cond.notify_all()
+                        if self._closing:
+                            if store is not None:
+                                store.close()
+                            return
+                        self._cond.wait()
+                        continue
+                    wait = self._due()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                self._inflight = self._pending
+                batch = list(self._inflight.values())
+                self._pending = {}
+                self._first_queued = self._last_queued = None
+                self._writing = True
+
+            latencies = []
+            failed = 0
+            for func, args in batch:
+                start = time.perf_counter()
+                try:
+                    func(store, *args)
+                except Exception as e:
+                    failed += 1
+                    print(f"后台保存出错:{e}")
+                latencies.append(time.perf_counter() - start)
+
+            with self._cond:
+                self._writing = False
+                self._inflight = {}
+                self.batches += 1
+                self.written += len(batch) - failed
+                self.failed += failed
+                self.total_latency += sum(latencies)
+                self.max_latency = max(self.max_latency, *latencies)
+                self._cond.notify_all()
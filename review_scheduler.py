@@ -0,0 +1,29 @@
+# 一天的秒数
+DAY = 86400
+
+# SM-2 的默认难度系数和下限
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# 答错时难度系数的降低量
+LAPSE_PENALTY = 0.2
+
+
+def next_schedule(reps, interval, ease, is_correct, now):
+    """按SM-2计算下一次复习, 返回 (连续答对次数, 间隔天数, 难度系数, 到期时间)
+
+    答对时间隔依次为1天、6天, 之后乘以难度系数; 答错时间隔清零并立即到期,
+    难度系数降低LAPSE_PENALTY(不低于MIN_EASE)。只有对错两种结果,
+    答对按SM-2的4分处理, 难度系数不变。
+    """
+    if not is_correct:
+        return 0, 0.0, max(MIN_EASE, ease - LAPSE_PENALTY), now
+    reps += 1
+    if reps == 1:
+        interval = 1.0
+    elif reps == 2:
+        interval = 6.0
+    else:
+        interval = max(1.0, round(interval * ease, 2))
+    return reps, interval, ease, now + interval * DAY
+
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import pickle
+from array import array
+
+from bank_scanner import stat_docx_files
+from quiz_cache import DEFAULT_CACHE_DIR, CACHE_VERSION, atomic_write
+from quiz_question import normalize_text
+from quiz_reader import QuizReader
+
+# 索引格式版本(题目以pickle保存, 随解析缓存版本一起失效)
+# 3: 每段保存题目的检索文本
+SEARCH_VERSION = (3, CACHE_VERSION)
+
+# 默认索引目录(解析缓存目录下)
+DEFAULT_SEARCH_DIR = os.path.join(DEFAULT_CACHE_DIR, 'search')
+
+
+def question_search_text(question):
+    """用于检索的文本: 规范化后的题干和选项内容"""
+    return normalize_text(question.text + '\n' + '\n'.join(question.option_texts))
+
+
+def tokenize(text):
+    """检索词条: 所有单个字符和相邻两个字符"""
+    tokens = set(text)
+    tokens.update(text[i:i + 2] for i in range(len(text) - 1))
+    return tokens
+
+
+def query_tokens(text):
+    """查询用的词条: 两个字符以上时只需相邻两字, 否则为该字符本身"""
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def build_postings(texts):
+    """由各题的检索文本建立倒排索引并压缩为 (以\\0分隔的词条, 偏移数组, 题目序号数组)"""
+    postings = {}
+    for i, text in enumerate(texts):
+        for token in tokenize(text):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = [i]
+            else:
+                ids.append(i)
+    offsets = array('I', [0])
+    ids = array('I')
+    for token_ids in postings.values():
+        ids.extend(token_ids)
+        offsets.append(len(ids))
+    return '\0'.join(postings), offsets, ids
+
+
+class Segment:
+    """一个题库文件的倒排索引
+
+    词条的题目序号连续存放在一个数组中, offsets记录每个词条的起止位置,
+    保存和读取时只需处理三个大对象。各题的检索文本只在建立时规范化一次,
+    与索引一起保存, 确认连续出现时直接使用。
+    """
+
+    __slots__ = ('name', 'stat', 'questions', 'texts', 'token_text', 'offsets', 'ids', 'tokens')
+
+    def __init__(self, name, stat, questions, texts=None, packed=None):
+        self.name = name
+        self.stat = stat  # (大小, 修改时间), 用于判断文件是否变化
+        self.questions = questions
+        self.texts = texts or tuple(question_search_text(question) for question in questions)
+        self.token_text, self.offsets, self.ids = packed or build_postings(self.texts)
+        self.tokens = {token: k for k, token in enumerate(self.token_text.split('\0'))} \
+            if self.token_text else {}  # {词条: 序号}
+
+    def packed(self):
+        return self.token_text, self.offsets, self.ids
+
+    def postings(self, token):
+        """包含某个词条的题目序号"""
+        k = self.tokens.get(token)
+        if k is None:
+            return None
+        return self.ids[self.offsets[k]:self.offsets[k + 1]]
+
+    def search(self, query_text):
+        """返回包含query_text的题目序号(按题目顺序)"""
+        lists = []
+        for token in query_tokens(query_text):
+            ids = self.postings(token)
+            if ids is None:
+                return []
+            lists.append(ids)
+        # 从最短的列表开始求交集
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        if len(query_text) <= 2:
+            return sorted(candidates)
+        # 词条都出现不代表连续出现, 再确认一次原文
+        texts = self.texts
+        return [i for i in sorted(candidates) if query_text in texts[i]]
+
+
+class SearchIndex:
+    """题库文件夹的全文检索索引
+
+    中文按单字和相邻两字切分词条, 每个题库文件单独建立一段倒排索引并保存在
+    解析缓存目录下, 文件未变化(大小和修改时间相同)时直接复用, 因此更新
+    只需重新处理新增或修改过的文件。
+    """
+
+    def __init__(self, index_dir=DEFAULT_SEARCH_DIR):
+        self.index_dir = index_dir
+        self.folder = None
+        self.segments = {}  # {文件名: Segment}
+
+    def _segment_path(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        return os.path.join(self.index_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _load_segment(self, path, name, stat):
+        try:
+            with open(self._segment_path(path), 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"读取检索索引失败:{e}")
+            return None
+        if data.get('version') != SEARCH_VERSION or data.get('stat') != stat:
+            return None
+        return Segment(name, stat, data['questions'], data['texts'], data['postings'])
+
+    def _save_segment(self, path, segment):
+        data = {
+            'version': SEARCH_VERSION,
+            'stat': segment.stat,
+            'questions': segment.questions,
+            'texts': segment.texts,
+            'postings': segment.packed()
+        }
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            atomic_write(self._segment_path(path), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"保存检索索引失败:{e}")
+
+    def update(self, folder, job=None):
+        """按文件夹当前内容增量更新索引(可在后台线程中执行)
+
+        job为quiz_jobs.Job时报告进度并响应取消。
+        """
+        stats = stat_docx_files(folder)
+        current = self.segments if folder == self.folder else {}
+        segments = {}
+        for i, (name, stat) in enumerate(sorted(stats.items())):
+            if job is not None:
+                job.check_cancelled()
+                job.progress(i, len(stats), f"正在建立检索索引 {i + 1}/{len(stats)}")
+            segment = current.get(name)
+            if segment is not None and segment.stat == stat:
+                segments[name] = segment
+                continue
+            path = os.path.join(folder, name)
+            segment = self._load_segment(path, name, stat)
+            if segment is None:
+                try:
+                    segment = Segment(name, stat, QuizReader(path).questions)
+                except Exception as e:
+                    print(f"读取文件 {name} 时出错:{e}")
+                    continue
+                self._save_segment(path, segment)
+            segments[name] = segment
+        self.prune(folder, stats)
+        # 整体替换, 更新过程中的查询仍使用旧索引
+        self.folder = folder
+        self.segments = segments
+        return self
+
+    def prune(self, folder, stats):
+        """删除不属于folder当前文件的索引段
+
+        包括程序关闭期间被删除的题库和之前打开过的其他文件夹(每段都保存了
+        题目的完整副本)。切换回其他文件夹时由解析缓存重建, 代价很小。
+        """
+        keep = {os.path.basename(self._segment_path(os.path.join(folder, name))) for name in stats}
+        try:
+            entries = list(os.scandir(self.index_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith('.pickle') and entry.name not in keep:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return sum(len(segment.questions) for segment in self.segments.values())
+
+    def search(self, query, limit=None):
+        """查找题干或选项中包含query的题目, 返回 [(文件名, 题目)]"""
+        query_text = normalize_text(query)
+        if not query_text:
+            return []
+        results = []
+        segments = self.segments
+        for name in sorted(segments):
+            segment = segments[name]
+            ids = segment.search(query_text)
+            results.extend((name, segment.questions[i]) for i in ids)
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
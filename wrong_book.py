@@ -0,0 +1,35 @@
+import json
+import os
+
+from quiz_question import Question, QUESTION_TYPES
+
+
+class WrongQuestionBook:
+    """旧版本的错题本wrong_questions.json(只读, 供QuizStore.import_legacy_json导入)
+
+    文件结构为 {'questions': {题型: {题目哈希: {'question': 题目字典, 'correct_count': 次数}}},
+    'threshold': 答对多少次后移出错题本}。加载时不修改文件。
+    """
+
+    def __init__(self, path, remove_threshold=2):
+        self.path = path
+        self.questions = {q_type: {} for q_type in QUESTION_TYPES}
+        self.threshold = remove_threshold  # 答对多少次后移出错题本
+
+    def load(self):
+        """读取错题本文件, 文件不存在时为空"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for q_type, questions in data.get('questions', {}).items():
+            bucket = self.questions.setdefault(q_type, {})
+            for q_hash, q_data in questions.items():
+                bucket[q_hash] = {
+                    'question': Question.from_dict(q_data['question']),
+                    'correct_count': q_data.get('correct_count', 0)
+                }
+        self.threshold = data.get('threshold', self.threshold)
+
+    def total(self):
+        return sum(len(questions) for questions in self.questions.values())